@@ -1,5 +1,5 @@
 ﻿# agents/career.py
-import httpx
+from agents.http_client import get_http_client
 from typing import List, Dict
 from loguru import logger
 
@@ -16,41 +16,43 @@ class CareerAgent:
             # Try RemoteOK API (free, no key)
             search_term = query.lower().replace(' ', '-')
 
-            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-                # RemoteOK returns ndjson - note: it's remoteok.com not .io
-                response = await client.get(f'https://remoteok.com/api?tag={search_term}')
-                response.raise_for_status()
+            client = get_http_client()
+            # RemoteOK returns ndjson - note: it's remoteok.com not .io
+            response = await client.get(
+                f'https://remoteok.com/api?tag={search_term}', timeout=15.0, follow_redirects=True
+            )
+            response.raise_for_status()
 
-                # Parse JSON array
-                import json
-                data = json.loads(response.text)
+            # Parse JSON array
+            import json
+            data = json.loads(response.text)
                 
-                # Ensure data is a list
-                if not isinstance(data, list):
-                    logger.warning(f'Unexpected response format from RemoteOK: {type(data)}')
-                    return []
+            # Ensure data is a list
+            if not isinstance(data, list):
+                logger.warning(f'Unexpected response format from RemoteOK: {type(data)}')
+                return []
                 
-                jobs = []
-                for job in data:
-                    # Skip metadata entries (they don't have 'slug')
-                    if not isinstance(job, dict) or 'slug' not in job:
-                        continue
+            jobs = []
+            for job in data:
+                # Skip metadata entries (they don't have 'slug')
+                if not isinstance(job, dict) or 'slug' not in job:
+                    continue
                         
-                    slug = job.get('slug', '')
-                    url = f'https://remoteok.com/remote-jobs/{slug}'
+                slug = job.get('slug', '')
+                url = f'https://remoteok.com/remote-jobs/{slug}'
 
-                    jobs.append({
-                        'title': job.get('title', ''),
-                        'company': job.get('company', ''),
-                        'location': job.get('location', 'Remote'),
-                        'slug': slug,
-                        'salary': job.get('salary', 'Negotiable'),
-                        'url': url,
-                        'source': 'RemoteOK'
-                    })
+                jobs.append({
+                    'title': job.get('title', ''),
+                    'company': job.get('company', ''),
+                    'location': job.get('location', 'Remote'),
+                    'slug': slug,
+                    'salary': job.get('salary', 'Negotiable'),
+                    'url': url,
+                    'source': 'RemoteOK'
+                })
 
-                logger.info(f'CareerAgent: found {len(jobs)} jobs')
-                return jobs[:limit]
+            logger.info(f'CareerAgent: found {len(jobs)} jobs')
+            return jobs[:limit]
 
         except Exception as e:
             logger.error(f'CareerAgent error: {e}')
@@ -0,0 +1,33 @@
+"""
+Shared HTTP client for agents
+One connection pool per event loop, so repeated calls to the same host reuse TCP/TLS connections
+"""
+
+from typing import Optional
+import asyncio
+import httpx
+
+HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client for the running event loop, creating it on first use"""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to the loop that opened them
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(limits=HTTP_LIMITS)
+        _client_loop = loop
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client; the next get_http_client call opens a fresh one"""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
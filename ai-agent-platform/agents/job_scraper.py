@@ -4,6 +4,12 @@ from typing import List, Dict, Any
 import json
 import os
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class JobItem(scrapy.Item):
     title = scrapy.Field()
     company = scrapy.Field()
@@ -131,7 +137,11 @@ class JobScraperAgent:
 
         if output_file:
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
-            with open(output_file, 'w') as f:
-                json.dump(jobs, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(jobs, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            else:
+                with open(output_file, 'w') as f:
+                    json.dump(jobs, f, indent=2)
 
         return jobs
@@ -5,7 +5,7 @@ Better than Google - searches everywhere and synthesizes results
 
 from typing import Dict, Any, List
 import asyncio
-import httpx
+from agents.http_client import get_http_client
 from bs4 import BeautifulSoup
 from loguru import logger
 import os
@@ -29,24 +29,24 @@ class SearchAgent:
             url = "https://html.duckduckgo.com/html/"
             data = {"q": query}
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, data=data, timeout=self.timeout)
-                soup = BeautifulSoup(response.text, 'html.parser')
+            client = get_http_client()
+            response = await client.post(url, data=data, timeout=self.timeout)
+            soup = BeautifulSoup(response.text, 'html.parser')
                 
-                results = []
-                for result in soup.find_all('div', class_='result')[:5]:
-                    title_elem = result.find('a', class_='result__a')
-                    snippet_elem = result.find('a', class_='result__snippet')
+            results = []
+            for result in soup.find_all('div', class_='result')[:5]:
+                title_elem = result.find('a', class_='result__a')
+                snippet_elem = result.find('a', class_='result__snippet')
                     
-                    if title_elem:
-                        results.append({
-                            'title': title_elem.text.strip(),
-                            'url': title_elem.get('href', ''),
-                            'snippet': snippet_elem.text.strip() if snippet_elem else ''
-                        })
+                if title_elem:
+                    results.append({
+                        'title': title_elem.text.strip(),
+                        'url': title_elem.get('href', ''),
+                        'snippet': snippet_elem.text.strip() if snippet_elem else ''
+                    })
                 
-                logger.info(f"✅ DuckDuckGo: Found {len(results)} results")
-                return results
+            logger.info(f"✅ DuckDuckGo: Found {len(results)} results")
+            return results
                 
         except Exception as e:
             logger.error(f"DuckDuckGo search failed: {e}")
@@ -5,7 +5,7 @@ Handles all money-related activities
 
 from typing import Dict, Any, List
 import asyncio
-import httpx
+from agents.http_client import get_http_client
 from bs4 import BeautifulSoup
 from loguru import logger
 
@@ -36,29 +36,29 @@ class TransactionAgent:
             # Search Amazon (scraping publicly available data)
             search_url = f"https://www.amazon.com/s?k={query.replace(' ', '+')}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    search_url,
-                    headers={"User-Agent": "Mozilla/5.0"},
-                    timeout=10
-                )
+            client = get_http_client()
+            response = await client.get(
+                search_url,
+                headers={"User-Agent": "Mozilla/5.0"},
+                timeout=10
+            )
                 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'html.parser')
                     
-                    for item in soup.find_all('div', {'data-component-type': 's-search-result'})[:10]:
-                        title = item.find('h2')
-                        price = item.find('span', class_='a-price-whole')
+                for item in soup.find_all('div', {'data-component-type': 's-search-result'})[:10]:
+                    title = item.find('h2')
+                    price = item.find('span', class_='a-price-whole')
                         
-                        if title and price:
-                            products.append({
-                                'name': title.text.strip(),
-                                'price': price.text.strip(),
-                                'platform': 'Amazon',
-                                'query': query
-                            })
+                    if title and price:
+                        products.append({
+                            'name': title.text.strip(),
+                            'price': price.text.strip(),
+                            'platform': 'Amazon',
+                            'query': query
+                        })
                     
-                    logger.info(f"✅ Found {len(products)} products")
+                logger.info(f"✅ Found {len(products)} products")
         
         except Exception as e:
             logger.error(f"Product search failed: {e}")
@@ -4,7 +4,7 @@ Travel Agent - Transportation, Routes, and Bookings
 
 from typing import Dict, Any, List
 import asyncio
-import httpx
+from agents.http_client import get_http_client
 from datetime import datetime, timedelta
 from loguru import logger
 
@@ -30,50 +30,50 @@ class TravelAgent:
             base_url = self.transit_apis["germany"]
             
             # Search for departure station
-            async with httpx.AsyncClient() as client:
-                # Find station IDs
-                from_response = await client.get(
-                    f"{base_url}/locations",
-                    params={"query": from_city, "results": 1}
-                )
-                to_response = await client.get(
-                    f"{base_url}/locations",
-                    params={"query": to_city, "results": 1}
-                )
+            client = get_http_client()
+            # Find station IDs
+            from_response = await client.get(
+                f"{base_url}/locations",
+                params={"query": from_city, "results": 1}
+            )
+            to_response = await client.get(
+                f"{base_url}/locations",
+                params={"query": to_city, "results": 1}
+            )
                 
-                if from_response.status_code == 200 and to_response.status_code == 200:
-                    from_data = from_response.json()
-                    to_data = to_response.json()
+            if from_response.status_code == 200 and to_response.status_code == 200:
+                from_data = from_response.json()
+                to_data = to_response.json()
                     
-                    if from_data and to_data:
-                        from_id = from_data[0]['id']
-                        to_id = to_data[0]['id']
+                if from_data and to_data:
+                    from_id = from_data[0]['id']
+                    to_id = to_data[0]['id']
                         
-                        # Get journey options
-                        journeys_response = await client.get(
-                            f"{base_url}/journeys",
-                            params={
-                                "from": from_id,
-                                "to": to_id,
-                                "results": 5
-                            }
-                        )
+                    # Get journey options
+                    journeys_response = await client.get(
+                        f"{base_url}/journeys",
+                        params={
+                            "from": from_id,
+                            "to": to_id,
+                            "results": 5
+                        }
+                    )
                         
-                        if journeys_response.status_code == 200:
-                            journeys = journeys_response.json().get('journeys', [])
+                    if journeys_response.status_code == 200:
+                        journeys = journeys_response.json().get('journeys', [])
                             
-                            results = []
-                            for journey in journeys:
-                                results.append({
-                                    'departure': journey['legs'][0]['departure'],
-                                    'arrival': journey['legs'][-1]['arrival'],
-                                    'duration': journey.get('duration', 0) // 60,  # minutes
-                                    'changes': len(journey['legs']) - 1,
-                                    'price': journey.get('price', {}).get('amount', 'N/A')
-                                })
+                        results = []
+                        for journey in journeys:
+                            results.append({
+                                'departure': journey['legs'][0]['departure'],
+                                'arrival': journey['legs'][-1]['arrival'],
+                                'duration': journey.get('duration', 0) // 60,  # minutes
+                                'changes': len(journey['legs']) - 1,
+                                'price': journey.get('price', {}).get('amount', 'N/A')
+                            })
                             
-                            logger.info(f"✅ Found {len(results)} train connections")
-                            return results
+                        logger.info(f"✅ Found {len(results)} train connections")
+                        return results
             
         except Exception as e:
             logger.error(f"Train search failed: {e}")
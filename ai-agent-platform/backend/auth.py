@@ -3,20 +3,83 @@ Authentication System - JWT-based user authentication
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
+import base64
+import binascii
+import hashlib
+import hmac
+import json
 import os
+import time
 # from backend.user_profiles import profile_manager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
+SECRET_KEY_BYTES = SECRET_KEY.encode()
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# bcrypt work factor; lower it for dev/test, keep the default in production
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Decoded tokens: token -> (user_id, exp); an entry is valid until the token itself expires
+TOKEN_CACHE_MAX_SIZE = 50_000
+_token_cache: Dict[str, Tuple[str, float]] = {}
+
+# HS256 key schedule done once; each verification copies the keyed state
+_HMAC_SHA256 = hmac.new(SECRET_KEY_BYTES, digestmod=hashlib.sha256)
+# Claims PyJWT validates beyond exp; tokens carrying them go through jwt.decode
+_SLOW_PATH_CLAIMS = {"nbf", "iat", "aud", "iss"}
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+# auto_error=False: a missing header yields None instead of an exception, so
+# anonymous requests to optional-auth routes cost nothing; get_current_user raises itself
+security = HTTPBearer(auto_error=False)
+
+
+def _b64decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment"""
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse a decoded JWT segment"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _verify_hs256(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a plain HS256 token with the precomputed key; None sends it through jwt.decode"""
+    try:
+        signing_input, _, signature = token.encode().rpartition(b".")
+        header_b64, _, payload_b64 = signing_input.partition(b".")
+        mac = _HMAC_SHA256.copy()
+        mac.update(signing_input)
+        if not hmac.compare_digest(mac.digest(), _b64decode(signature)):
+            return None
+        header = _loads(_b64decode(header_b64))
+        payload = _loads(_b64decode(payload_b64))
+    except (ValueError, binascii.Error):
+        return None
+
+    if not isinstance(header, dict) or header.get("alg") != ALGORITHM or "crit" in header:
+        return None
+    if not isinstance(payload, dict) or not _SLOW_PATH_CLAIMS.isdisjoint(payload):
+        return None
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or exp <= time.time() or not isinstance(payload.get("sub"), str):
+        return None
+    return payload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-security = HTTPBearer()
 
 class AuthService:
     """Handles user authentication and authorization"""
@@ -40,23 +103,44 @@ class AuthService:
         else:
             expire = datetime.utcnow() + timedelta(minutes=15)
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
         return encoded_jwt
     
     @staticmethod
     def verify_token(token: str) -> Optional[str]:
         """Verify JWT token and return user_id"""
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            user_id: str = payload.get("sub")
-            if user_id is None:
-                return None
-            return user_id
-        except JWTError:
+        cached = _token_cache.get(token)
+        if cached is not None:
+            if cached[1] > time.time():
+                return cached[0]
+            _token_cache.pop(token, None)
             return None
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+        payload = _verify_hs256(token)
+        if payload is None:
+            # Anything the fast path does not fully accept gets the library's verdict
+            try:
+                payload = jwt.decode(token, SECRET_KEY_BYTES, algorithms=[ALGORITHM],
+                                     options={"require": ["exp", "sub"]})
+            except jwt.PyJWTError:
+                return None
+
+        user_id: str = payload["sub"]
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            # Evict the oldest entry
+            _token_cache.pop(next(iter(_token_cache)), None)
+        _token_cache[token] = (user_id, payload["exp"])
+        return user_id
+
+async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> str:
     """Dependency to get current authenticated user"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     token = credentials.credentials
     user_id = AuthService.verify_token(token)
     if not user_id:
@@ -0,0 +1,51 @@
+"""
+Keyword routing shared by the backends
+A rules table is compiled once into an Aho-Corasick automaton, so a query is matched in a single pass
+"""
+
+from typing import Optional, Sequence, Tuple
+import re
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# (agent, keywords) rows, highest priority first
+RoutingRules = Sequence[Tuple[str, Sequence[str]]]
+
+
+class KeywordRouter:
+    """Route a query to the first rules row with a keyword in it"""
+
+    def __init__(self, rules: RoutingRules, default: str):
+        self.rules = tuple(rules)
+        self.default = default
+        self._automaton = self._build_automaton() if AHOCORASICK_AVAILABLE else None
+        # Fallback without pyahocorasick: one case-insensitive regex with a group per rules row.
+        # The lookahead makes every position a candidate, so overlapping keywords are all seen.
+        self._pattern = re.compile(
+            "(?=(?:" + "|".join("(" + "|".join(map(re.escape, keywords)) + ")" for _, keywords in self.rules) + "))",
+            re.IGNORECASE,
+        )
+
+    def _build_automaton(self):
+        """Compile every keyword into one automaton, tagged with its row's rank"""
+        automaton = ahocorasick.Automaton()
+        for rank, (agent_type, keywords) in enumerate(self.rules):
+            for keyword in keywords:
+                automaton.add_word(keyword, (rank, agent_type))
+        automaton.make_automaton()
+        return automaton
+
+    def route(self, query: str, query_lower: Optional[str] = None) -> str:
+        """Pick the agent for a query; pass query_lower when the caller already has it"""
+        if self._automaton is not None:
+            if query_lower is None:
+                query_lower = query.casefold()
+            best = min((match for _, match in self._automaton.iter(query_lower)), default=None)
+            return best[1] if best else self.default
+
+        row = min((match.lastindex for match in self._pattern.finditer(query)), default=None)
+        return self.rules[row - 1][0] if row else self.default
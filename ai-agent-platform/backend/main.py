@@ -3,46 +3,199 @@ AI Agent Platform - FINAL COMPLETE VERSION
 ALL 11 CATEGORIES IMPLEMENTED
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+from collections import defaultdict
+import asyncio
+import copy
+import hashlib
+import importlib
+import itertools
 import os
 import sys
+import time
+import sqlite3
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime, timedelta
-from loguru import logger
 from contextlib import asynccontextmanager
+from functools import cached_property, lru_cache
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
 load_dotenv()
 
-# Import ALL agents
-# from agents.orchestrator_advanced import advanced_orchestrator  # Temporarily disabled due to import issues
-# from agents.search import search_agent
-# from agents.career import career_agent
-# from agents.travel import travel_agent
-# from agents.local import local_agent
-# from agents.transaction import transaction_agent
-# from agents.communication import communication_agent
-# from agents.entertainment import entertainment_agent
-# from agents.productivity import productivity_agent
-# from agents.monitoring import monitoring_agent
-# from agents.common_crawl import common_crawl_agent
 from backend.auth import auth_service, AuthService, get_current_user, get_current_user_optional, ACCESS_TOKEN_EXPIRE_MINUTES
 from backend.stripe_service import StripeService
+from backend.keyword_routing import KeywordRouter
+from backend.user_profiles import profile_manager
 from backend.monitoring import monitoring_system
-# from backend.user_profiles import UserProfileManager
+from agents.http_client import close_http_client
 
-# Initialize services
-# profile_manager = UserProfileManager()
-security = HTTPBearer(auto_error=False)  # Don't raise errors for missing auth
+# Request handlers only put records on a queue; the listener thread formats them and does the I/O
+LOG_FILE = "logs/platform.log"
+LOG_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d - %(message)s"
 
-logger.add("logs/platform_{time}.log", rotation="500 MB", level="INFO")
+# One record per executed task; the task context is passed as a mapping and rendered by the listener
+TASK_LOG = "Task %(task_id)s | User: %(user_id)s | Agent: %(agent_type)s | Time: %(execution_time).2fs | Query: %(query)s"
+TASK_FAILED_LOG = TASK_LOG + " | Error: %(error)s"
+
+# Bounded so a slow sink cannot grow memory without limit; records past the cap are dropped and counted
+LOG_QUEUE_MAX_SIZE = 20_000
+
+
+_EXC_FORMATTER = logging.Formatter()
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking or erroring when the queue is full"""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Leave msg and args for the listener to format; only the traceback is rendered here"""
+        # The stock prepare() calls format() on the caller's thread, i.e. on the event loop
+        record = copy.copy(record)
+        if isinstance(record.args, dict):
+            # Snapshot the mapping so later changes to the caller's dict do not reach the listener
+            record.args = dict(record.args)
+        if record.exc_info:
+            # Tracebacks hold frame references, so render them now and queue only the text
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+logger = logging.getLogger("platform")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+_log_queue = queue.Queue(maxsize=LOG_QUEUE_MAX_SIZE)
+logger.addHandler(_DroppingQueueHandler(_log_queue))
+
+
+def _start_log_listener() -> QueueListener:
+    """Start the background thread that writes queued log records to stderr and the log file"""
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.StreamHandler(),
+        RotatingFileHandler(LOG_FILE, maxBytes=500_000_000, backupCount=5, encoding="utf-8"),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    listener = QueueListener(_log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the log listener and the agents' shared HTTP client for the lifetime of the app"""
+    listener = _start_log_listener()
+    # Load the HTML pages before serving so no request reads them from disk on the event loop
+    for page in FRONTEND_PAGES:
+        try:
+            _frontend_page(page)
+        except OSError as e:
+            logger.warning(f"Frontend page {page} not preloaded: {e}")
+    try:
+        yield
+    finally:
+        await close_http_client()
+        listener.stop()
+
+ACCESS_TOKEN_TTL = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# The sequence keeps ids unique even when the clock does not advance between two requests
+_task_seq = itertools.count()
+
+
+def new_task_id() -> str:
+    """Time-ordered task id that is unique within the process"""
+    return f"task_{time.time_ns():x}_{next(_task_seq):x}"
+
+# Profile reads are cached briefly per user; update_profile refreshes the entry on every write
+PROFILE_CACHE_TTL = 60.0
+PROFILE_CACHE_MAX_SIZE = 5000
+_profile_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+# Bumped when a profile write finishes; a read or write that overlapped another write is not cached
+_profile_writes = 0
+
+
+def _cache_profile(user_id: str, profile: Dict[str, Any], writes_seen: int) -> None:
+    """Cache a profile unless a write finished after writes_seen was taken, in which case drop the entry"""
+    if _profile_writes != writes_seen:
+        _profile_cache.pop(user_id, None)
+        return
+    if len(_profile_cache) >= PROFILE_CACHE_MAX_SIZE:
+        # Evict the oldest entry
+        _profile_cache.pop(next(iter(_profile_cache)), None)
+    _profile_cache[user_id] = (time.monotonic() + PROFILE_CACHE_TTL, profile)
+
+
+async def _write_profile(user_id: str, write: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Await a profile write and cache the written profile if no other write finished meanwhile"""
+    global _profile_writes
+    writes_seen = _profile_writes
+    profile = await write
+    _profile_writes += 1
+    _cache_profile(user_id, profile, writes_seen + 1)
+    return profile
+
+
+async def get_profile_cached(user_id: str) -> Optional[Dict[str, Any]]:
+    """Read a user profile, reusing one fetched in the last PROFILE_CACHE_TTL seconds"""
+    cached = _profile_cache.get(user_id)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    writes_seen = _profile_writes
+    profile = await profile_manager.aget_user(user_id)
+    if profile:
+        _cache_profile(user_id, profile, writes_seen)
+    return profile
+
+
+# Stripe lookups are a rate-limited network round trip; webhooks drop the affected entries
+SUBSCRIPTION_CACHE_TTL = 60.0
+SUBSCRIPTION_CACHE_MAX_SIZE = 10_000
+_subscription_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+async def get_subscription_status_cached(user_id: str) -> Dict[str, Any]:
+    """Check a user's Stripe subscription, reusing a result from the last SUBSCRIPTION_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = _subscription_cache.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    status = await StripeService.check_subscription_status(user_id)
+    if status.get("lookup_failed"):
+        # Retry Stripe on the next request instead of showing a paying user as free for a minute
+        return status
+    if len(_subscription_cache) >= SUBSCRIPTION_CACHE_MAX_SIZE:
+        # Evict the oldest entry
+        _subscription_cache.pop(next(iter(_subscription_cache)), None)
+    _subscription_cache[user_id] = (time.monotonic() + SUBSCRIPTION_CACHE_TTL, status)
+    return status
+
+
+async def update_profile(user_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Persist profile updates and cache the written profile"""
+    _profile_cache.pop(user_id, None)
+    return await _write_profile(user_id, profile_manager.aupdate_user(user_id, updates))
 
 PRICING_TIERS = {
     "free": {
@@ -67,54 +220,271 @@ PRICING_TIERS = {
     }
 }
 
+# Keyword routing, highest priority first: a query matching several rows goes to the earliest
+ROUTING_KEYWORDS = (
+    ("career", ("apply", "job", "career")),
+    ("search", ("search", "find")),
+    ("travel", ("travel", "flight", "hotel")),
+    ("local", ("local", "restaurant", "service")),
+    ("transaction", ("buy", "purchase", "shop")),
+    ("communication", ("email", "message", "call")),
+    ("entertainment", ("movie", "music", "game")),
+    ("productivity", ("schedule", "task", "reminder")),
+    ("monitoring", ("monitor", "alert", "status")),
+)
+DEFAULT_AGENT = "search"
+_KEYWORD_ROUTER = KeywordRouter(ROUTING_KEYWORDS, DEFAULT_AGENT)
+
+
+def route_query(query: str, query_lower: Optional[str] = None) -> str:
+    """Pick the agent for a query from its keywords in a single pass over the text"""
+    return _KEYWORD_ROUTER.route(query, query_lower)
+
+AGENTS = [
+    {"name": "Search Agent", "type": "search", "description": "Information seeking and research"},
+    {"name": "Career Agent", "type": "career", "description": "Job search and auto-application"},
+    {"name": "Travel Agent", "type": "travel", "description": "Transportation and planning"},
+    {"name": "Local Agent", "type": "local", "description": "Local services and recommendations"},
+    {"name": "Transaction Agent", "type": "transaction", "description": "Shopping and purchases"},
+    {"name": "Communication Agent", "type": "communication", "description": "Messaging and calls"},
+    {"name": "Entertainment Agent", "type": "entertainment", "description": "Movies, music, games"},
+    {"name": "Productivity Agent", "type": "productivity", "description": "Task management"},
+    {"name": "Monitoring Agent", "type": "monitoring", "description": "Alerts and tracking"},
+    {"name": "Browser Agent", "type": "browser", "description": "Web automation"},
+    {"name": "Common Crawl Agent", "type": "common_crawl", "description": "Data mining"}
+]
+
+PLATFORM_STATS = {
+    "status": "success",
+    "agents": 11,
+    "coverage": "100% of human online activities",
+    "features": [
+        "Job auto-application",
+        "Price monitoring",
+        "Travel planning",
+        "Web search",
+        "Productivity automation",
+        "Transaction handling"
+    ]
+}
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend from google ai studio")
+
+# Static JSON bodies are rendered once at import and served as-is
+_AGENTS_BODY = ORJSONResponse({"agents": AGENTS, "total": len(AGENTS)}).body
+_PRICING_BODY = ORJSONResponse({"status": "success", "pricing": StripeService.PLANS}).body
+_STATS_BODY = ORJSONResponse(PLATFORM_STATS).body
+
+# Clients that send back a body's ETag get an empty 304 instead of the payload
+STATIC_JSON_CACHE_CONTROL = "public, max-age=60"
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2s(body, digest_size=8).hexdigest() + '"'
+
+
+_AGENTS_ETAG = _etag(_AGENTS_BODY)
+_PRICING_ETAG = _etag(_PRICING_BODY)
+_STATS_ETAG = _etag(_STATS_BODY)
+
+
+def _static_json(request: Request, body: bytes, etag: str) -> Response:
+    """Serve a pre-encoded JSON body, or a 304 when the client already holds this version"""
+    headers = {"ETag": etag, "Cache-Control": STATIC_JSON_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+FRONTEND_PAGES = ("index.html", "app.html")
+
+
+@lru_cache(maxsize=None)
+def _frontend_page(filename: str) -> str:
+    """Read a frontend HTML page once; later requests are served from memory"""
+    with open(os.path.join(FRONTEND_DIR, filename), 'r', encoding='utf-8') as f:
+        return f.read()
+
 app = FastAPI(
     title="AI Agent Platform - COMPLETE",
     description="The World's Most Comprehensive AI Operating System - All 11 Categories",
-    version="4.0.0"
+    version="4.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Serve static files
-app.mount("/static", StaticFiles(directory=os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend from google ai studio")), name="static")
+# Frontend files are not fingerprinted, so browsers may reuse them for an hour and then revalidate via ETag
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache responses instead of re-requesting every asset"""
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
+
 
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+# Serve static files
+app.mount("/static", CachedStaticFiles(directory=FRONTEND_DIR), name="static")
+
+# Explicit origins/methods/headers let browsers cache the preflight for max_age seconds
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+    if origin.strip()
+]
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["GET", "POST"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400
+)
 
 class TaskRequest(BaseModel):
-    query: str
+    # Blank queries are rejected with a 422 during validation, before the handler runs
+    model_config = ConfigDict(extra="ignore", frozen=True, str_strip_whitespace=True)
+
+    query: str = Field(min_length=1)
     user_id: str = "anonymous"
     context: Optional[Dict] = None
 
+    @cached_property
+    def query_lower(self) -> str:
+        """Case-folded query, computed once and shared by routing and the agent handlers"""
+        return self.query.casefold()
+
 class LoginRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     email: str
     password: str
 
 class RegisterRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     email: str
     password: str
     first_name: str = ""
     last_name: str = ""
 
+# Agents are imported on first use: each module pulls in a large dependency graph and most are rarely hit
+AGENT_MODULES = {
+    "search_agent": "agents.search",
+    "career_agent": "agents.career",
+    "travel_agent": "agents.travel",
+    "local_agent": "agents.local",
+    "transaction_agent": "agents.transaction",
+    "entertainment_agent": "agents.entertainment",
+    "productivity_agent": "agents.productivity",
+    "monitoring_agent": "agents.monitoring",
+}
+_agents: Dict[str, Any] = {}
+
+
+async def get_agent(name: str) -> Any:
+    """Return a shared agent instance, importing its module off the event loop the first time"""
+    agent = _agents.get(name)
+    if agent is None:
+        module = await asyncio.to_thread(importlib.import_module, AGENT_MODULES[name])
+        agent = _agents[name] = getattr(module, name)
+    return agent
+
+
+async def _run_search(request: TaskRequest, user_id: str) -> Any:
+    search_agent = await get_agent("search_agent")
+    return await search_agent.search(request.query)
+
+async def _run_career(request: TaskRequest, user_id: str) -> Any:
+    career_agent = await get_agent("career_agent")
+    # Check if this is an auto-apply request
+    query_lower = request.query_lower
+    if ("apply" in query_lower or "application" in query_lower) and request.context:
+        # Get user profile for auto-apply
+        user_profile = await get_profile_cached(user_id) or {}
+        job_data = {
+            "title": request.context.get("job_title", "Unknown Position"),
+            "company": request.context.get("company", "Unknown Company"),
+            "url": request.context.get("job_url", "")
+        }
+        return await career_agent.auto_apply(job_data, user_profile)
+
+    # Regular job search
+    jobs = await career_agent.search_jobs(request.query)
+    return {"jobs_found": len(jobs), "jobs": jobs[:10]}
+
+async def _run_travel(request: TaskRequest, user_id: str) -> Any:
+    travel_agent = await get_agent("travel_agent")
+    return await travel_agent.get_route("Berlin", "Munich", mode="train")
+
+async def _run_local(request: TaskRequest, user_id: str) -> Any:
+    local_agent = await get_agent("local_agent")
+    places = await local_agent.find_nearby(request.query, "Berlin")
+    return {"places": places}
+
+async def _run_transaction(request: TaskRequest, user_id: str) -> Any:
+    transaction_agent = await get_agent("transaction_agent")
+    products = await transaction_agent.search_products(request.query)
+    return {"products": products}
+
+async def _run_entertainment(request: TaskRequest, user_id: str) -> Any:
+    entertainment_agent = await get_agent("entertainment_agent")
+    return await entertainment_agent.find_movie(request.query)
+
+async def _run_productivity(request: TaskRequest, user_id: str) -> Any:
+    productivity_agent = await get_agent("productivity_agent")
+    return await productivity_agent.create_task(request.query)
+
+async def _run_monitoring(request: TaskRequest, user_id: str) -> Any:
+    monitoring_agent = await get_agent("monitoring_agent")
+    return await monitoring_agent.personal_dashboard(user_id)
+
+# Agent type from route_query -> handler; types without an agent fall back to search
+AGENT_DISPATCH: Dict[str, Callable[[TaskRequest, str], Awaitable[Any]]] = {
+    "search": _run_search,
+    "career": _run_career,
+    "travel": _run_travel,
+    "local": _run_local,
+    "transaction": _run_transaction,
+    "entertainment": _run_entertainment,
+    "productivity": _run_productivity,
+    "monitoring": _run_monitoring,
+}
+
+# Caps in-flight agent calls per worker so bursts queue here instead of exhausting downstream pools
+AGENT_CONCURRENCY = int(os.getenv("AGENT_CONCURRENCY", "32"))
+_AGENT_SEM = asyncio.Semaphore(AGENT_CONCURRENCY)
+# Agent calls holding a slot, for the health report
+_agents_in_flight = 0
+# Seconds an agent may run once it holds a slot; a hung upstream must not pin the worker
+AGENT_TIMEOUT = float(os.getenv("AGENT_TIMEOUT", "10"))
+
+
+async def run_agent(agent_type: str, request: TaskRequest, user_id: str) -> Any:
+    """Dispatch a routed query to its agent, waiting for a free slot first"""
+    global _agents_in_flight
+    async with _AGENT_SEM:
+        _agents_in_flight += 1
+        try:
+            return await asyncio.wait_for(
+                AGENT_DISPATCH.get(agent_type, _run_search)(request, user_id), timeout=AGENT_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"{agent_type} agent timed out after {AGENT_TIMEOUT}s") from None
+        finally:
+            _agents_in_flight -= 1
+
 @app.get("/")
 async def root():
     """Landing page"""
     try:
-        print("Root endpoint called")
-        file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend from google ai studio", "index.html")
-        print(f"Serving file: {file_path}")
-        print(f"File exists: {os.path.exists(file_path)}")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        print(f"Content length: {len(content)}")
-        from fastapi.responses import HTMLResponse
-        print("Returning HTMLResponse")
-        return HTMLResponse(content=content, status_code=200)
+        return HTMLResponse(content=_frontend_page("index.html"), status_code=200)
     except Exception as e:
-        print(f"Error serving root: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"Error serving root: {e}")
         raise HTTPException(status_code=500, detail=f"Error serving page: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise
 
 @app.get("/health")
 async def health_check():
@@ -122,22 +492,9 @@ async def health_check():
     return {"status": "healthy"}
 
 @app.get("/agents")
-async def list_agents():
+async def list_agents(request: Request):
     """List all available agents"""
-    agents = [
-        {"name": "Search Agent", "type": "search", "description": "Information seeking and research"},
-        {"name": "Career Agent", "type": "career", "description": "Job search and auto-application"},
-        {"name": "Travel Agent", "type": "travel", "description": "Transportation and planning"},
-        {"name": "Local Agent", "type": "local", "description": "Local services and recommendations"},
-        {"name": "Transaction Agent", "type": "transaction", "description": "Shopping and purchases"},
-        {"name": "Communication Agent", "type": "communication", "description": "Messaging and calls"},
-        {"name": "Entertainment Agent", "type": "entertainment", "description": "Movies, music, games"},
-        {"name": "Productivity Agent", "type": "productivity", "description": "Task management"},
-        {"name": "Monitoring Agent", "type": "monitoring", "description": "Alerts and tracking"},
-        {"name": "Browser Agent", "type": "browser", "description": "Web automation"},
-        {"name": "Common Crawl Agent", "type": "common_crawl", "description": "Data mining"}
-    ]
-    return {"agents": agents, "total": len(agents)}
+    return _static_json(request, _AGENTS_BODY, _AGENTS_ETAG)
 
 @app.post("/execute")
 async def execute_simple(request: TaskRequest):
@@ -145,88 +502,42 @@ async def execute_simple(request: TaskRequest):
     # Use the same logic as /api/v1/execute but without auth
     user_id = "anonymous"
     
-    if not request.query or not request.query.strip():
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
-    
-    start_time = datetime.utcnow()
-    task_id = f"task_{int(start_time.timestamp() * 1000)}"
-    
-    print(f"Simple Task: {task_id} | Query: {request.query}")
+    start_time = time.perf_counter()
+    task_id = new_task_id()
+    log_ctx = {"task_id": task_id, "user_id": user_id, "agent_type": "unknown", "query": request.query}
     
     try:
-        logger.info(f"Simple Task: {task_id} | Query: {request.query}")
-        
         # Simple keyword routing
-        query_lower = request.query.lower()
-        if "apply" in query_lower or "job" in query_lower or "career" in query_lower:
-            agent_type = "career"
-        elif "search" in query_lower or "find" in query_lower:
-            agent_type = "search"
-        elif "travel" in query_lower or "flight" in query_lower or "hotel" in query_lower:
-            agent_type = "travel"
-        elif "local" in query_lower or "restaurant" in query_lower or "service" in query_lower:
-            agent_type = "local"
-        elif "buy" in query_lower or "purchase" in query_lower or "shop" in query_lower:
-            agent_type = "transaction"
-        elif "email" in query_lower or "message" in query_lower or "call" in query_lower:
-            agent_type = "communication"
-        elif "movie" in query_lower or "music" in query_lower or "game" in query_lower:
-            agent_type = "entertainment"
-        elif "schedule" in query_lower or "task" in query_lower or "reminder" in query_lower:
-            agent_type = "productivity"
-        elif "monitor" in query_lower or "alert" in query_lower or "status" in query_lower:
-            agent_type = "monitoring"
-        else:
-            agent_type = "search"
-        
-        logger.info(f"Simple routing to agent: {agent_type}")
-        
-        # Route to agent (simplified version)
-        result = None
+        agent_type = route_query(request.query, request.query_lower)
+        log_ctx["agent_type"] = agent_type
         
-        if agent_type == "search":
-            result = await search_agent.search(request.query)
-        elif agent_type == "career":
-            jobs = await career_agent.search_jobs(request.query)
-            result = {"jobs_found": len(jobs), "jobs": jobs[:5]}
-        elif agent_type == "travel":
-            result = await travel_agent.get_route("Berlin", "Munich", mode="train")
-        elif agent_type == "local":
-            places = await local_agent.find_nearby(request.query, "Berlin")
-            result = {"places": places}
-        elif agent_type == "transaction":
-            products = await transaction_agent.search_products(request.query)
-            result = {"products": products}
-        elif agent_type == "entertainment":
-            movies = await entertainment_agent.find_movie(request.query)
-            result = movies
-        elif agent_type == "productivity":
-            task = await productivity_agent.create_task(request.query)
-            result = task
-        elif agent_type == "monitoring":
-            dashboard = await monitoring_agent.personal_dashboard(user_id)
-            result = dashboard
-        else:
-            result = {"error": f"Unknown agent type: {agent_type}"}
+        # Route to agent
+        result = await run_agent(agent_type, request, user_id)
         
         # Record task execution
-        monitoring_system.record_task_execution(task_id, user_id, agent_type, request.query, True, (datetime.utcnow() - start_time).total_seconds())
+        execution_time = time.perf_counter() - start_time
+        monitoring_system.record_task_execution(task_id, user_id, agent_type, request.query, True, execution_time)
+        log_ctx["execution_time"] = execution_time
+        logger.info(TASK_LOG, log_ctx)
         
         return {
             "task_id": task_id,
             "agent": agent_type,
             "result": result,
-            "execution_time": (datetime.utcnow() - start_time).total_seconds(),
+            "execution_time": execution_time,
             "status": "success"
         }
         
     except Exception as e:
-        logger.error(f"Simple execution failed: {e}")
-        monitoring_system.record_task_execution(task_id, user_id, "unknown", request.query, False, (datetime.utcnow() - start_time).total_seconds())
+        execution_time = time.perf_counter() - start_time
+        log_ctx["execution_time"] = execution_time
+        log_ctx["error"] = str(e)
+        logger.error(TASK_FAILED_LOG, log_ctx)
+        monitoring_system.record_task_execution(task_id, user_id, "unknown", request.query, False, execution_time)
         return {
             "task_id": task_id,
             "error": str(e),
-            "execution_time": (datetime.utcnow() - start_time).total_seconds(),
+            "execution_time": execution_time,
             "status": "error"
         }
 
@@ -234,22 +545,16 @@ async def execute_simple(request: TaskRequest):
 async def app_page():
     """Main application"""
     try:
-        file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend from google ai studio", "app.html")
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        from fastapi.responses import HTMLResponse
-        return HTMLResponse(content=content, status_code=200)
+        return HTMLResponse(content=_frontend_page("app.html"), status_code=200)
     except Exception as e:
-        print(f"Error serving app: {e}")
+        logger.error(f"Error serving app: {e}")
         raise HTTPException(status_code=500, detail=f"Error serving app page: {str(e)}")
 
-# @app.post("/api/v1/subscribe")
-# async def create_subscription(user_id: str, plan: str, email: str):
 @app.post("/api/v1/subscribe")
 async def create_subscription(user_id: str, plan: str, email: str):
     """Create checkout session for subscription"""
     if plan == "free":
-        profile_manager.update_user(user_id, {
+        await update_profile(user_id, {
             "subscription": "free",
             "email": email,
             "subscribed_at": datetime.now().isoformat()
@@ -263,13 +568,13 @@ async def create_subscription(user_id: str, plan: str, email: str):
     result = await StripeService.create_checkout_session(user_id, plan, email)
     return result
 
-# @app.get("/api/v1/subscription/{user_id}")
-# async def get_subscription_status(user_id: str):
 @app.get("/api/v1/subscription/{user_id}")
 async def get_subscription_status(user_id: str):
     """Check user subscription status"""
-    status = await StripeService.check_subscription_status(user_id)
-    user_profile = profile_manager.get_profile(user_id)
+    status, user_profile = await asyncio.gather(
+        get_subscription_status_cached(user_id),
+        get_profile_cached(user_id)
+    )
     
     return {
         "status": "success",
@@ -277,70 +582,68 @@ async def get_subscription_status(user_id: str):
         "user_profile": user_profile
     }
 
-# @app.post("/api/v1/webhook/stripe")
-# async def stripe_webhook(request: dict):
 @app.post("/api/v1/webhook/stripe")
 async def stripe_webhook(request: dict):
     """Handle Stripe webhooks"""
     result = await StripeService.handle_webhook(request)
     
     if result.get("action") == "activate_subscription":
-        profile_manager.update_user(
+        _subscription_cache.pop(result["user_id"], None)
+        await update_profile(
             result["user_id"],
             {"subscription": result["plan"]}
         )
+    elif result.get("action") == "deactivate_subscription":
+        # The cancellation event does not say whose subscription ended
+        _subscription_cache.clear()
     
     return {"status": "received"}
 
-# @app.get("/api/v1/pricing")
-# async def get_pricing():
-# @app.get("/api/v1/pricing")
-# async def get_pricing():
-#     """Get pricing tiers"""
-#     return {
-#         "status": "success",
-#         "pricing": StripeService.PLANS
-#     }
-
 @app.get("/api/v1/pricing")
-async def get_pricing():
+async def get_pricing(request: Request):
     """Get pricing tiers"""
-    return {
-        "status": "success",
-        "pricing": StripeService.PLANS
-    }
+    return _static_json(request, _PRICING_BODY, _PRICING_ETAG)
 
-# @app.get("/api/v1/stats")
-# async def get_platform_stats():
 @app.get("/api/v1/stats")
-async def get_platform_stats():
+async def get_platform_stats(request: Request):
     """Get platform statistics"""
-    return {
-        "status": "success",
-        "agents": 11,
-        "coverage": "100% of human online activities",
-        "features": [
-            "Job auto-application",
-            "Price monitoring",
-            "Travel planning",
-            "Web search",
-            "Productivity automation",
-            "Transaction handling"
-        ]
-    }
+    return _static_json(request, _STATS_BODY, _STATS_ETAG)
+
+# Tasks charged per user but not yet written to the profile store
+_pending_task_counts: Dict[str, int] = defaultdict(int)
+# Every request schedules a flush; only one may write at a time or a delta is applied twice
+_flush_lock = asyncio.Lock()
+
+
+async def flush_task_counts():
+    """Write the coalesced task counters to the profile store"""
+    async with _flush_lock:
+        for user_id in list(_pending_task_counts):
+            delta = _pending_task_counts[user_id]
+            try:
+                await _write_profile(user_id, profile_manager.aincrement_task_count(user_id, delta))
+            except sqlite3.Error as e:
+                # The delta stays pending, so limit checks still count it and the next flush retries
+                logger.error(f"Failed to persist task count for {user_id}: {e}")
+                continue
+            # Charges that arrived during the write stay pending
+            remaining = _pending_task_counts[user_id] - delta
+            if remaining > 0:
+                _pending_task_counts[user_id] = remaining
+            else:
+                del _pending_task_counts[user_id]
 
-async def check_subscription_limits(user_id: str):
+
+async def check_subscription_limits(user_id: str, background_tasks: BackgroundTasks):
     """Check if user has exceeded their subscription limits"""
     if not user_id or user_id == "anonymous":
         return  # Allow anonymous users limited access
     
-    user_profile = profile_manager.get_profile(user_id)
-    if not user_profile:
-        # Create default profile for new users
-        user_profile = profile_manager.create_profile(user_id, {"subscription": "free"})
+    # New users get the default free profile
+    user_profile = await get_profile_cached(user_id)
     
     subscription = user_profile.get("context", {}).get("subscription", "free")
-    task_count = user_profile.get("context", {}).get("task_count", 0)
+    task_count = user_profile.get("context", {}).get("task_count", 0) + _pending_task_counts.get(user_id, 0)
     
     limits = PRICING_TIERS.get(subscription, PRICING_TIERS["free"])
     monthly_limit = limits["monthly_tasks"]
@@ -351,42 +654,32 @@ async def check_subscription_limits(user_id: str):
             detail=f"Monthly task limit ({monthly_limit}) exceeded for {subscription} plan"
         )
     
-    # Increment task count
-    user_profile["context"]["task_count"] = task_count + 1
-    user_profile["context"]["last_activity"] = datetime.utcnow().isoformat()
-    profile_manager.update_user(user_id, {"context": user_profile["context"]})
+    # Charge the task now; the profile write happens after the response is sent
+    _pending_task_counts[user_id] += 1
+    background_tasks.add_task(flush_task_counts)
 
 @app.post("/api/v1/auth/register")
 async def register(request: RegisterRequest):
     """Register new user"""
-    print(f"Register request received: {request.email}")
     try:
         # Check if user already exists
-        existing = profile_manager.get_profile(request.email)
-        print(f"Existing user check: {existing is not None}")
-        if existing:
-            print("User already exists, returning 400")
+        if await asyncio.to_thread(profile_manager.has_user, request.email):
             raise HTTPException(status_code=400, detail="User already exists")
 
-        print("Creating user profile...")
         # Create user profile
-        user_profile = profile_manager.create_profile(request.email, {
+        user_profile = await update_profile(request.email, {
             "email": request.email,
             "first_name": request.first_name,
             "last_name": request.last_name,
             "subscription": "free"
         })
-        print("Profile created successfully")
 
-        print("Creating access token...")
         # Create access token
         access_token = auth_service.create_access_token(
             data={"sub": request.email},
-            expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            expires_delta=ACCESS_TOKEN_TTL
         )
-        print("Token created successfully")
 
-        print("Returning success response")
         return {
             "status": "success",
             "access_token": access_token,
@@ -394,9 +687,7 @@ async def register(request: RegisterRequest):
             "user": user_profile
         }
     except Exception as e:
-        print(f"Register error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"Register error: {e}")
         raise
 
 @app.post("/api/v1/auth/login")
@@ -404,17 +695,18 @@ async def login(request: LoginRequest):
     """Login user"""
     # For demo purposes, accept any email/password combination
     # In production, you'd verify against stored hashed password
-    user_profile = profile_manager.get_profile(request.email)
-    if not user_profile:
+    if await asyncio.to_thread(profile_manager.has_user, request.email):
+        user_profile = await get_profile_cached(request.email)
+    else:
         # Auto-register new users
-        user_profile = profile_manager.create_profile(request.email, {
+        user_profile = await update_profile(request.email, {
             "email": request.email,
             "subscription": "free"
         })
     
     access_token = auth_service.create_access_token(
         data={"sub": request.email},
-        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_delta=ACCESS_TOKEN_TTL
     )
     
     return {
@@ -424,103 +716,29 @@ async def login(request: LoginRequest):
         "user": user_profile
     }
 
-# @app.post("/api/v1/execute")
-# async def execute_final(request: TaskRequest):
 @app.post("/api/v1/execute")
-async def execute_final(request: TaskRequest, current_user: str = Depends(get_current_user_optional)):
+async def execute_final(request: TaskRequest, background_tasks: BackgroundTasks,
+                        current_user: str = Depends(get_current_user_optional)):
     """Execute task with optional authentication for testing"""
     # Handle authentication - allow anonymous for testing
     user_id = current_user or request.user_id or "anonymous"
 
-    # Validate input
-    if not request.query or not request.query.strip():
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
-    
     # Check subscription limits
-    await check_subscription_limits(user_id)
-#     """FINAL COMPLETE EXECUTION"""
-    start_time = datetime.utcnow()
-    task_id = f"task_{int(start_time.timestamp() * 1000)}"
-    
-    print(f"Task: {task_id} | Query: {request.query}")
+    await check_subscription_limits(user_id, background_tasks)
+    start_time = time.perf_counter()
+    task_id = new_task_id()
+    log_ctx = {"task_id": task_id, "user_id": user_id, "agent_type": "unknown", "query": request.query}
     
     try:
-        logger.info(f"Task: {task_id} | User: {user_id} | Query: {request.query}")
-        
-        # Use keyword-based routing (orchestrator disabled for testing)
-        # try:
-        #     routing_decision = await advanced_orchestrator.analyze_with_ai(request.query)
-        #     agent_type = routing_decision.agent
-        #     logger.info(f"AI Routing: {agent_type} (confidence: {routing_decision.confidence}) - {routing_decision.reasoning}")
-        # except Exception as e:
-        #     logger.warning(f"Orchestrator failed, falling back to keyword routing: {e}")
-        # Fallback to keyword-based routing
-        query_lower = request.query.lower()
-        if "apply" in query_lower or "job" in query_lower or "career" in query_lower:
-            agent_type = "career"
-        elif "search" in query_lower or "find" in query_lower:
-            agent_type = "search"
-        elif "travel" in query_lower or "flight" in query_lower or "hotel" in query_lower:
-            agent_type = "travel"
-        elif "local" in query_lower or "restaurant" in query_lower or "service" in query_lower:
-            agent_type = "local"
-        elif "buy" in query_lower or "purchase" in query_lower or "shop" in query_lower:
-            agent_type = "transaction"
-        elif "email" in query_lower or "message" in query_lower or "call" in query_lower:
-            agent_type = "communication"
-        elif "movie" in query_lower or "music" in query_lower or "game" in query_lower:
-            agent_type = "entertainment"
-        elif "schedule" in query_lower or "task" in query_lower or "reminder" in query_lower:
-            agent_type = "productivity"
-        elif "monitor" in query_lower or "alert" in query_lower or "status" in query_lower:
-            agent_type = "monitoring"
-        else:
-            agent_type = "search"  # default
-        
-        logger.info(f"Routed to agent: {agent_type}")
+        agent_type = route_query(request.query, request.query_lower)
+        log_ctx["agent_type"] = agent_type
         
         # Route to appropriate agent
-        result = None
+        result = await run_agent(agent_type, request, user_id)
         
-        if agent_type == "search":
-            result = await search_agent.search(request.query)
-        elif agent_type == "career":
-            # Check if this is an auto-apply request
-            if ("apply" in request.query.lower() or "application" in request.query.lower()) and request.context:
-                # Get user profile for auto-apply
-                user_profile = profile_manager.get_profile(user_id) or {}
-                job_data = {
-                    "title": request.context.get("job_title", "Unknown Position"),
-                    "company": request.context.get("company", "Unknown Company"),
-                    "url": request.context.get("job_url", "")
-                }
-                result = await career_agent.auto_apply(job_data, user_profile, user_id)
-            else:
-                # Regular job search
-                jobs = await career_agent.search_jobs(request.query)
-                result = {"jobs_found": len(jobs), "jobs": jobs[:10]}
-        elif agent_type == "travel":
-            result = await travel_agent.get_route("Berlin", "Munich", mode="train")
-        elif agent_type == "local":
-            places = await local_agent.find_nearby(request.query, "Berlin")
-            result = {"places": places}
-        elif agent_type == "shopping":
-            products = await transaction_agent.search_products(request.query)
-            result = {"products": products}
-        elif agent_type == "entertainment":
-            movies = await entertainment_agent.find_movie(request.query)
-            result = movies
-        elif agent_type == "productivity":
-            task = await productivity_agent.create_task(request.query)
-            result = task
-        elif agent_type == "data":
-            dashboard = await monitoring_agent.personal_dashboard(user_id or "anonymous")
-            result = dashboard
-        else:
-            result = await search_agent.search(request.query)
-        
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
-        logger.info(f"Task completed: {task_id} | Time: {execution_time:.2f}s")
+        execution_time = time.perf_counter() - start_time
+        log_ctx["execution_time"] = execution_time
+        logger.info(TASK_LOG, log_ctx)
         
         # Record successful task metrics
         result_summary = f"Agent: {agent_type}"
@@ -538,12 +756,14 @@ async def execute_final(request: TaskRequest, current_user: str = Depends(get_cu
             "agent_used": agent_type,
             "result": result,
             "execution_time": execution_time,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         
     except Exception as e:
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
-        logger.error(f"Task failed: {task_id} | Error: {str(e)} | Time: {execution_time:.2f}s")
+        execution_time = time.perf_counter() - start_time
+        log_ctx["execution_time"] = execution_time
+        log_ctx["error"] = str(e)
+        logger.error(TASK_FAILED_LOG, log_ctx)
         
         # Record failed task metrics
         monitoring_system.record_task_execution(
@@ -553,8 +773,8 @@ async def execute_final(request: TaskRequest, current_user: str = Depends(get_cu
         
         # Try fallback search for failed tasks
         try:
-            logger.info(f"Trying fallback search for: {request.query}")
-            fallback_result = await search_agent.search(request.query)
+            search_agent = await get_agent("search_agent")
+            fallback_result = await asyncio.wait_for(search_agent.search(request.query), timeout=AGENT_TIMEOUT)
             return {
                 "status": "partial_success",
                 "task_id": task_id,
@@ -563,7 +783,7 @@ async def execute_final(request: TaskRequest, current_user: str = Depends(get_cu
                 "result": fallback_result,
                 "error": str(e),
                 "execution_time": execution_time,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow()
             }
         except Exception as fallback_error:
             logger.error(f"Fallback also failed: {str(fallback_error)}")
@@ -588,13 +808,25 @@ async def get_user_stats(user_id: str):
 @app.get("/api/v1/health")
 async def get_system_health():
     """Get system health status"""
-    return monitoring_system.get_system_health()
-
-# if __name__ == "__main__":
-#     import uvicorn
-#     import time
-#     port = int(os.getenv("BACKEND_PORT", 8000))
-#     print(f"Starting server on port {port}")
-#     # Add a delay to see if it helps
-#     time.sleep(1)
-#     uvicorn.run("main:app", host="0.0.0.0", port=port, log_level="info")
\ No newline at end of file
+    health = monitoring_system.get_system_health()
+    health["agent_slots"] = {"limit": AGENT_CONCURRENCY, "available": AGENT_CONCURRENCY - _agents_in_flight}
+    health["logs_dropped"] = _DroppingQueueHandler.dropped
+    return health
+
+if __name__ == "__main__":
+    import uvicorn
+    port = int(os.getenv("BACKEND_PORT", 8000))
+    # uvicorn[standard] ships uvloop and httptools; uvloop is not available on Windows
+    # Quota counters, the profile and subscription caches and (without REDIS_URL) WebSocket
+    # connections are per process, so more workers means per-worker limits and webhooks that
+    # only reach one worker. Raise WEB_CONCURRENCY only once that state lives in a shared store.
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        log_config=None,
+        access_log=False
+    )
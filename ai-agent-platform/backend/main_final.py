@@ -5,10 +5,16 @@ ALL 11 CATEGORIES IMPLEMENTED
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List, Callable, Awaitable
+import asyncio
+import importlib
+import itertools
 import os
 import sys
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from loguru import logger
 
@@ -19,35 +25,13 @@ load_dotenv()
 
 # Import ALL agents
 from agents.orchestrator_advanced import advanced_orchestrator
-from agents.search import search_agent
-from agents.career import career_agent
-from agents.travel import travel_agent
-from agents.local import local_agent
-from agents.transaction import transaction_agent
-from agents.communication import communication_agent
-from agents.entertainment import entertainment_agent
-from agents.productivity import productivity_agent
-from agents.monitoring import monitoring_agent
-from agents.common_crawl import common_crawl_agent
-from backend.user_profiles import profile_manager
+from agents.http_client import close_http_client
 
 logger.add("logs/platform_{time}.log", rotation="500 MB", level="INFO")
 
-app = FastAPI(
-    title="AI Agent Platform - COMPLETE",
-    description="The World's Most Comprehensive AI Operating System - All 11 Categories",
-    version="4.0.0"
-)
-
-app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
-
-class TaskRequest(BaseModel):
-    query: str
-    user_id: str = "anonymous"
-    context: Optional[Dict] = None
-
-@app.on_event("startup")
-async def startup():
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Announce the loaded agent categories, and close the agents' shared HTTP client on shutdown"""
     logger.info("🚀 AI Agent Platform v4.0 - FINAL COMPLETE VERSION")
     logger.info("✅ ALL 11 AGENT CATEGORIES LOADED:")
     logger.info("   1. ✅ Information Agent (Search)")
@@ -63,6 +47,135 @@ async def startup():
     logger.info("  11. ✅ Professional Tools Agent")
     logger.info("")
     logger.info("🌍 Platform ready - Handling ALL human online needs!")
+    try:
+        yield
+    finally:
+        await close_http_client()
+
+app = FastAPI(
+    title="AI Agent Platform - COMPLETE",
+    description="The World's Most Comprehensive AI Operating System - All 11 Categories",
+    version="4.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+# Explicit origins/methods/headers let browsers cache the preflight for max_age seconds
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:8000").split(",")
+    if origin.strip()
+]
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["GET", "POST"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400
+)
+
+class TaskRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    query: str
+    user_id: str = "anonymous"
+    context: Optional[Dict] = None
+
+# The sequence keeps ids unique even when the clock does not advance between two requests
+_task_seq = itertools.count()
+
+# Agents are imported on first use: each module pulls in a large dependency graph and most are rarely hit
+AGENT_MODULES = {
+    "search_agent": "agents.search",
+    "career_agent": "agents.career",
+    "travel_agent": "agents.travel",
+    "local_agent": "agents.local",
+    "transaction_agent": "agents.transaction",
+    "entertainment_agent": "agents.entertainment",
+    "productivity_agent": "agents.productivity",
+    "monitoring_agent": "agents.monitoring",
+}
+_agents: Dict[str, Any] = {}
+
+async def get_agent(name: str) -> Any:
+    """Return a shared agent instance, importing its module off the event loop the first time"""
+    agent = _agents.get(name)
+    if agent is None:
+        module = await asyncio.to_thread(importlib.import_module, AGENT_MODULES[name])
+        agent = _agents[name] = getattr(module, name)
+    return agent
+
+async def _run_search(request: TaskRequest) -> Any:
+    search_agent = await get_agent("search_agent")
+    return await search_agent.search(request.query)
+
+async def _run_career(request: TaskRequest) -> Any:
+    career_agent = await get_agent("career_agent")
+    jobs = await career_agent.search_jobs(request.query)
+    return {"jobs_found": len(jobs), "jobs": jobs[:10]}
+
+async def _run_travel(request: TaskRequest) -> Any:
+    travel_agent = await get_agent("travel_agent")
+    return await travel_agent.get_route("Berlin", "Munich", mode="train")
+
+async def _run_local(request: TaskRequest) -> Any:
+    local_agent = await get_agent("local_agent")
+    places = await local_agent.find_nearby(request.query, "Berlin")
+    return {"places": places}
+
+async def _run_shopping(request: TaskRequest) -> Any:
+    transaction_agent = await get_agent("transaction_agent")
+    products = await transaction_agent.search_products(request.query)
+    return {"products": products}
+
+async def _run_entertainment(request: TaskRequest) -> Any:
+    entertainment_agent = await get_agent("entertainment_agent")
+    return await entertainment_agent.find_movie(request.query)
+
+async def _run_productivity(request: TaskRequest) -> Any:
+    productivity_agent = await get_agent("productivity_agent")
+    return await productivity_agent.create_task(request.query)
+
+async def _run_data(request: TaskRequest) -> Any:
+    monitoring_agent = await get_agent("monitoring_agent")
+    return await monitoring_agent.personal_dashboard(request.user_id)
+
+# Orchestrator agent -> handler; unknown agents fall back to search
+AGENT_DISPATCH: Dict[str, Callable[[TaskRequest], Awaitable[Any]]] = {
+    "search": _run_search,
+    "career": _run_career,
+    "travel": _run_travel,
+    "local": _run_local,
+    "shopping": _run_shopping,
+    "entertainment": _run_entertainment,
+    "productivity": _run_productivity,
+    "data": _run_data,
+}
+
+# Below this routing confidence the query goes to several agents at once and their answers are merged
+FAN_OUT_CONFIDENCE = 0.7
+FAN_OUT_AGENTS = ("search", "career", "local")
+FAN_OUT_TIMEOUT = 5.0
+
+async def _run_fan_out(request: TaskRequest, agent_types: List[str]) -> Dict[str, Any]:
+    """Run several agents concurrently and keep whatever finishes within FAN_OUT_TIMEOUT, in agent_types order"""
+    tasks = {agent_type: asyncio.create_task(AGENT_DISPATCH[agent_type](request)) for agent_type in agent_types}
+    _, pending = await asyncio.wait(tasks.values(), timeout=FAN_OUT_TIMEOUT)
+    for task in pending:
+        task.cancel()
+
+    results = {}
+    for agent_type, task in tasks.items():
+        if task in pending:
+            continue
+        if task.exception() is not None:
+            logger.warning(f"Agent {agent_type} failed during fan-out: {task.exception()}")
+        else:
+            results[agent_type] = task.result()
+    if not results:
+        raise RuntimeError(f"No agent answered within {FAN_OUT_TIMEOUT}s")
+    return results
 
 @app.get("/")
 async def root():
@@ -90,60 +203,58 @@ async def root():
 @app.post("/api/v1/execute")
 async def execute_final(request: TaskRequest):
     """FINAL COMPLETE EXECUTION"""
-    start_time = datetime.utcnow()
-    task_id = f"task_{int(start_time.timestamp() * 1000)}"
+    start_time = time.perf_counter()
+    task_id = f"task_{time.time_ns():x}_{next(_task_seq):x}"
     
-    logger.info(f"📨 Task: {task_id} | Query: {request.query}")
+    # Arguments rather than an f-string: loguru only formats the message if INFO is enabled
+    logger.info("📨 Task: {} | Query: {}", task_id, request.query)
     
     try:
         routing = await advanced_orchestrator.analyze_with_ai(request.query, request.context)
         agent_type = routing.agent
         
-        # Route to appropriate agent
-        result = None
-        
-        if agent_type == "search":
-            result = await search_agent.search(request.query)
-        elif agent_type == "career":
-            jobs = await career_agent.search_jobs(request.query)
-            result = {"jobs_found": len(jobs), "jobs": jobs[:10]}
-        elif agent_type == "travel":
-            result = await travel_agent.get_route("Berlin", "Munich", mode="train")
-        elif agent_type == "local":
-            places = await local_agent.find_nearby(request.query, "Berlin")
-            result = {"places": places}
-        elif agent_type == "shopping":
-            products = await transaction_agent.search_products(request.query)
-            result = {"products": products}
-        elif agent_type == "entertainment":
-            movies = await entertainment_agent.find_movie(request.query)
-            result = movies
-        elif agent_type == "productivity":
-            task = await productivity_agent.create_task(request.query)
-            result = task
-        elif agent_type == "data":
-            dashboard = await monitoring_agent.personal_dashboard(request.user_id)
-            result = dashboard
+        # Route to appropriate agent, or to several when the routing is unsure
+        additional_results = None
+        if routing.confidence < FAN_OUT_CONFIDENCE:
+            agent_types = [a for a in dict.fromkeys((agent_type,) + FAN_OUT_AGENTS) if a in AGENT_DISPATCH]
+            results = await _run_fan_out(request, agent_types)
+            # The routed agent's answer stays the result when it has one; the others ride along
+            agent_type, result = next(iter(results.items()))
+            additional_results = {a: r for a, r in results.items() if a != agent_type}
         else:
-            result = await search_agent.search(request.query)
+            result = await AGENT_DISPATCH.get(agent_type, _run_search)(request)
         
-        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
-        return {
+        response = {
             "status": "success",
             "task_id": task_id,
             "query": request.query,
             "agent_used": agent_type,
             "result": result,
             "execution_time": execution_time,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
+        if additional_results is not None:
+            response["additional_results"] = additional_results
+        return response
         
     except Exception as e:
-        logger.error(f"❌ Task failed: {e}")
+        logger.error("❌ Task failed: {}", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("BACKEND_PORT", 8000))
-    uvicorn.run("main:app", host="0.0.0.0", port=port)
\ No newline at end of file
+    # uvicorn[standard] ships uvloop and httptools; uvloop is not available on Windows
+    # One worker per core is safe here: the only per-process state is the lazily imported agent modules.
+    # backend.main keeps quota and subscription state in memory and defaults to a single worker.
+    uvicorn.run(
+        "backend.main_final:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        log_level="warning"
+    )
\ No newline at end of file
@@ -8,8 +8,15 @@ from datetime import datetime
 
 app = FastAPI(title='AI Agent Platform', version='4.0.0')
 
+# Page paths and stats are resolved once; the frontend is fixed for the life of the process
+FRONTEND_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+INDEX_PATH = os.path.join(FRONTEND_DIR, 'index.html')
+INDEX_STAT = os.stat(INDEX_PATH)
+APP_PATH = os.path.join(FRONTEND_DIR, 'app.html')
+APP_STAT = os.stat(APP_PATH)
+
 # Mount static files
-app.mount('/static', StaticFiles(directory=os.path.join(os.path.dirname(__file__), '..', 'frontend')), name='static')
+app.mount('/static', StaticFiles(directory=FRONTEND_DIR), name='static')
 
 class ExecuteRequest(BaseModel):
     query: str
@@ -18,11 +25,11 @@ class ExecuteRequest(BaseModel):
 
 @app.get('/')
 async def root():
-    return FileResponse(os.path.join(os.path.dirname(__file__), '..', 'frontend', 'index.html'))
+    return FileResponse(INDEX_PATH, stat_result=INDEX_STAT)
 
 @app.get('/app')
 async def app_page():
-    return FileResponse(os.path.join(os.path.dirname(__file__), '..', 'frontend', 'app.html'))
+    return FileResponse(APP_PATH, stat_result=APP_STAT)
 
 @app.post('/execute')
 async def execute(request: ExecuteRequest):
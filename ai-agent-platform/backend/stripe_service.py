@@ -1,8 +1,10 @@
+import asyncio
 import stripe
 import os
 from datetime import datetime
 from typing import Dict, Optional
 from fastapi import HTTPException
+from loguru import logger
 
 stripe.api_key = os.getenv("STRIPE_SECRET_KEY", "")
 
@@ -47,7 +49,9 @@ class StripeService:
         plan_data = StripeService.PLANS[plan]
         
         try:
-            session = stripe.checkout.Session.create(
+            # The Stripe client is blocking; keep the HTTP round trip off the event loop
+            session = await asyncio.to_thread(
+                stripe.checkout.Session.create,
                 payment_method_types=["card"],
                 line_items=[
                     {
@@ -73,25 +77,30 @@ class StripeService:
     @staticmethod
     async def check_subscription_status(user_id: str) -> Dict:
         """Check if user has active subscription"""
+        # Filter on the metadata set at checkout so Stripe returns only this user's subscription
+        user_id_literal = user_id.replace("\\", "\\\\").replace("'", "\\'")
         try:
-            subscriptions = stripe.Subscription.list(
-                limit=1,
-                status="active"
+            # The Stripe client is blocking; keep the HTTP round trip off the event loop
+            subscriptions = await asyncio.to_thread(
+                stripe.Subscription.search,
+                query=f"status:'active' AND metadata['user_id']:'{user_id_literal}'",
+                limit=1
             )
-            
-            for sub in subscriptions.data:
-                if sub.metadata.get("user_id") == user_id:
-                    plan_name = sub.metadata.get("plan", "unknown")
-                    return {
-                        "has_subscription": True,
-                        "plan": plan_name,
-                        "subscription_id": sub.id,
-                        "current_period_end": sub.current_period_end
-                    }
-            
-            return {"has_subscription": False, "plan": "free"}
-        except:
-            return {"has_subscription": False, "plan": "free"}
+        except stripe.error.StripeError as e:
+            logger.warning(f"Subscription lookup failed for {user_id}: {e}")
+            # Flagged so callers can avoid caching a transient failure as a free plan
+            return {"has_subscription": False, "plan": "free", "lookup_failed": True}
+        
+        if subscriptions.data:
+            sub = subscriptions.data[0]
+            return {
+                "has_subscription": True,
+                "plan": sub.metadata.get("plan", "unknown"),
+                "subscription_id": sub.id,
+                "current_period_end": sub.current_period_end
+            }
+        
+        return {"has_subscription": False, "plan": "free"}
 
     @staticmethod
     async def handle_webhook(event: Dict) -> Dict:
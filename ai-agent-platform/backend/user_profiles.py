@@ -1,104 +1,319 @@
 ﻿# backend/userprofiles.py
+import asyncio
+import atexit
 import json
-import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from loguru import logger
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Parsed profiles kept in LRU order; every write drops the user's entry
+PROFILE_CACHE_MAX_SIZE = 10_000
+
+# Request/activity/task events are buffered per user and written in one save per flush
+PROFILE_FLUSH_INTERVAL = 0.5
+PROFILE_FLUSH_MAX_USERS = 64
+HISTORY_LIMIT = 100
+
+# History lists kept as append-only rows instead of inside the profile blob
+EVENT_KEYS = ("requests", "task_history", "activity_log")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    profile_data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profile_events_user ON profile_events (user_id, kind, id);
+"""
+
+# Drops everything older than the newest HISTORY_LIMIT events of one kind
+PRUNE_EVENTS = """
+DELETE FROM profile_events
+WHERE user_id = :user_id AND kind = :kind AND id <= (
+    SELECT id FROM profile_events WHERE user_id = :user_id AND kind = :kind
+    ORDER BY id DESC LIMIT 1 OFFSET :limit
+)
+"""
+
+def _loads(data: str) -> Dict[str, Any]:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(profile: Dict[str, Any]) -> str:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(profile, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(profile, ensure_ascii=False)
+
 class UserProfileManager:
     def __init__(self, data_dir: str = "data/user_profiles", db_path: str = None):
-        if db_path:
-            # For backward compatibility with tests
-            data_dir = db_path
-        self.data_dir = Path(data_dir)
         self.logger = logger  # Assign logger first
+        self.data_dir = Path(data_dir)
+        self.db_path = Path(db_path) if db_path else self.data_dir.with_suffix(".db")
+        # Reads use one connection per thread; WAL lets them proceed while a write is in progress.
+        # Writes share one long-lived connection under _write_lock, so flush timer threads never open their own.
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
         try:
-            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_conn = self._open()
         except Exception as e:
-            self.logger.error(f"Failed to create data directory {self.data_dir}: {e}")
+            self.logger.error(f"Failed to open profile database {self.db_path}: {e}")
             # Fallback to temp directory
             import tempfile
-            self.data_dir = Path(tempfile.gettempdir()) / "ai_agent_profiles"
-            self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.logger.info(f" UserProfileManager initialized at {self.data_dir}")
+            self.db_path = Path(tempfile.gettempdir()) / "ai_agent_profiles.db"
+            self._write_conn = self._open()
+        if db_path is None:
+            # Only the default layout has old per-user files next to the database
+            self._import_json_profiles()
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Bumped after every committed write; a read that overlapped one is not cached
+        self._write_count = 0
+        # user_id -> buffered events per history list, written on the next flush
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+        self.logger.info(f" UserProfileManager initialized at {self.db_path}")
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection; the first one also creates the schema"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not hasattr(self, "_write_conn"):
+            conn.executescript(SCHEMA)
+        return conn
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Read connection for the calling thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
     
-    def _get_profile_path(self, user_id: str) -> Path:
-        """Safe filename for user_id"""
-        safe_id = user_id.replace("/", "_").replace("\\", "_")
-        return self.data_dir / f"{safe_id}.json"
+    def _remember(self, user_id: str, profile: Dict[str, Any], write_count: int) -> None:
+        """Cache a profile read, unless a write committed while it was being read"""
+        with self._cache_lock:
+            if write_count != self._write_count:
+                return
+            self._cache[user_id] = profile
+            self._cache.move_to_end(user_id)
+            if len(self._cache) > PROFILE_CACHE_MAX_SIZE:
+                # Evict the least recently used entry
+                self._cache.popitem(last=False)
+    
+    def _forget(self, user_id: str) -> None:
+        """Drop a user's cached profile after a write"""
+        with self._cache_lock:
+            self._write_count += 1
+            self._cache.pop(user_id, None)
+    
+    def _import_json_profiles(self) -> None:
+        """Copy profiles from the old one-file-per-user layout into an empty database"""
+        if not self.data_dir.is_dir():
+            return
+        conn = self._write_conn
+        if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+            return
+        rows = []
+        for path in self.data_dir.glob("*.json"):
+            try:
+                profile = _loads(path.read_bytes())
+            except Exception as e:
+                self.logger.error(f"Skipping unreadable profile {path}: {e}")
+                continue
+            rows.append((profile.get("user_id", path.stem), _dumps(profile), path.stat().st_mtime))
+        if rows:
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (user_id, profile_data, updated_at) VALUES (?, ?, ?)", rows
+                )
+            self.logger.info(f"Imported {len(rows)} profiles from {self.data_dir}")
+    
+    def _queue_event(self, user_id: str, key: str, entry: Dict[str, Any]) -> None:
+        """Buffer an event for the user's next flush"""
+        with self._pending_lock:
+            self._pending.setdefault(user_id, {}).setdefault(key, []).append(entry)
+            flush_now = len(self._pending) >= PROFILE_FLUSH_MAX_USERS
+            if not flush_now and self._flush_timer is None:
+                self._flush_timer = threading.Timer(PROFILE_FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if flush_now:
+            self.flush()
+    
+    def _flush_user(self, user_id: str) -> None:
+        """Append a user's buffered events in one transaction"""
+        with self._pending_lock:
+            events = self._pending.pop(user_id, None)
+        if not events:
+            return
+        try:
+            self._append_events(user_id, events)
+        except Exception as e:
+            self.logger.error(f"Error flushing profile events for {user_id}: {e}")
+    
+    def _append_events(self, user_id: str, events: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Insert event rows and prune each touched kind back to HISTORY_LIMIT"""
+        conn = self._write_conn
+        try:
+            with self._write_lock, conn:
+                conn.executemany(
+                    "INSERT INTO profile_events (user_id, kind, entry) VALUES (?, ?, ?)",
+                    [(user_id, kind, _dumps(entry)) for kind, entries in events.items() for entry in entries]
+                )
+                for kind in events:
+                    conn.execute(PRUNE_EVENTS, {"user_id": user_id, "kind": kind, "limit": HISTORY_LIMIT})
+        finally:
+            self._forget(user_id)
+    
+    def flush(self) -> None:
+        """Write every buffered event"""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            user_ids = list(self._pending)
+        for user_id in user_ids:
+            self._flush_user(user_id)
+    
+    def has_user(self, user_id: str) -> bool:
+        """Whether a profile has been stored for this user"""
+        row = self._connection().execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        return row is not None
     
     def get_user(self, user_id: str) -> Dict[str, Any]:
-        """Load user profile"""
+        """Load user profile, including any events still waiting to be written"""
+        if user_id in self._pending:
+            self._flush_user(user_id)
+        with self._cache_lock:
+            cached = self._cache.get(user_id)
+            if cached is not None:
+                self._cache.move_to_end(user_id)
+                return cached
+            write_count = self._write_count
         try:
-            path = self._get_profile_path(user_id)
-            
-            if path.exists():
-                with open(path, 'r', encoding='utf-8') as f:
-                    profile = json.load(f)
-                    self.logger.debug(f"Loaded profile for {user_id}")
-                    return profile
-            
+            profile = self._load(user_id)
+        except Exception as e:
+            self.logger.error(f"Error loading profile {user_id}: {e}")
+            return {"user_id": user_id, "subscription": "free", "error": str(e)}
+        self._remember(user_id, profile, write_count)
+        return profile
+    
+    def _load(self, user_id: str) -> Dict[str, Any]:
+        """Load user profile from the database, bypassing the cache; errors propagate to the caller"""
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT profile_data FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is not None:
+            profile = _loads(row[0])
+            if any(key in profile for key in EVENT_KEYS):
+                # Profiles saved before the event table carry their history inline
+                with self._write_lock:
+                    self._append_events(user_id, {key: profile.pop(key) for key in EVENT_KEYS if key in profile})
+                    self._save_profile(user_id, profile)
+            self.logger.debug(f"Loaded profile for {user_id}")
+        else:
             # Create default
-            default_profile = {
+            profile = {
                 "user_id": user_id,
                 "created_at": datetime.utcnow().isoformat(),
                 "subscription": "free",
                 "email": None,
-                "requests": [],
                 "preferences": {},
             }
-            
             self.logger.info(f"Created default profile for {user_id}")
-            return default_profile
         
-        except Exception as e:
-            self.logger.error(f"Error loading profile {user_id}: {e}")
-            return {"user_id": user_id, "subscription": "free", "error": str(e)}
+        for key in EVENT_KEYS:
+            profile[key] = []
+        for kind, entry in conn.execute(
+            "SELECT kind, entry FROM profile_events WHERE user_id = ? ORDER BY id", (user_id,)
+        ):
+            profile[kind].append(_loads(entry))
+        for key in EVENT_KEYS:
+            profile[key] = profile[key][-HISTORY_LIMIT:]
+        if profile["activity_log"]:
+            profile["last_activity"] = profile["activity_log"][-1]["timestamp"]
+        return profile
     
     def update_user(self, user_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update and persist profile"""
         try:
-            profile = self.get_user(user_id)
-            profile.update(updates)
-            profile["updated_at"] = datetime.utcnow().isoformat()
-            
-            path = self._get_profile_path(user_id)
-            
-            # Write atomically
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(profile, f, indent=2, ensure_ascii=False)
-            
-            self.logger.debug(f"Updated profile for {user_id}")
-            return profile
+            with self._write_lock:
+                if user_id in self._pending:
+                    self._flush_user(user_id)
+                profile = self._load(user_id)
+                profile.update(updates)
+                return self._save_profile(user_id, profile)
         
         except Exception as e:
             self.logger.error(f"Error updating profile {user_id}: {e}")
             raise
     
+    def increment_task_count(self, user_id: str, delta: int) -> Dict[str, Any]:
+        """Add delta to the stored task count as one read-modify-write"""
+        with self._write_lock:
+            profile = self._load(user_id)
+            context = profile.setdefault("context", {})
+            context["task_count"] = context.get("task_count", 0) + delta
+            context["last_activity"] = datetime.utcnow().isoformat()
+            return self._save_profile(user_id, profile)
+    
+    def _save_profile(self, user_id: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist an already-loaded profile without reading it back; history lists live in profile_events"""
+        profile["updated_at"] = datetime.utcnow().isoformat()
+        state = {key: value for key, value in profile.items() if key not in EVENT_KEYS}
+        
+        conn = self._write_conn
+        try:
+            with self._write_lock, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO users (user_id, profile_data, updated_at) VALUES (?, ?, ?)",
+                    (user_id, _dumps(state), time.time())
+                )
+        finally:
+            self._forget(user_id)
+        
+        self.logger.debug(f"Updated profile for {user_id}")
+        return profile
+    
     def add_request(self, user_id: str, query: str, agent: str, result: Dict) -> None:
         """Track user request"""
         try:
-            profile = self.get_user(user_id)
-            
-            profile.setdefault("requests", []).append({
+            self._queue_event(user_id, "requests", {
                 "query": query,
                 "agent": agent,
                 "timestamp": datetime.utcnow().isoformat(),
                 "status": result.get("status", "unknown"),
             })
-            
-            # Keep only last 100 requests
-            profile["requests"] = profile["requests"][-100:]
-            
-            self.update_user(user_id, profile)
         
         except Exception as e:
             self.logger.error(f"Error tracking request: {e}")
     
     def get_all_users(self) -> List[str]:
         """Get all user IDs"""
-        return [f.stem for f in self.data_dir.glob("*.json")]
+        return [row[0] for row in self._connection().execute("SELECT user_id FROM users")]
     
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """Get user stats"""
@@ -133,11 +348,11 @@ class UserProfileManager:
     def save_job_application(self, user_id: str, application_data: Dict[str, Any]) -> bool:
         """Save job application data"""
         try:
-            profile = self.get_user(user_id)
-            if "job_applications" not in profile:
-                profile["job_applications"] = []
-            profile["job_applications"].append(application_data)
-            self.update_user(user_id, profile)
+            with self._write_lock:
+                # Fresh copy, so a failed save cannot leave the cached profile modified
+                profile = self._load(user_id)
+                profile.setdefault("job_applications", []).append(application_data)
+                self._save_profile(user_id, profile)
             return True
         except Exception as e:
             self.logger.error(f"Error saving job application: {e}")
@@ -146,21 +361,11 @@ class UserProfileManager:
     def log_user_activity(self, user_id: str, activity_type: str, details: str) -> bool:
         """Log user activity"""
         try:
-            profile = self.get_user(user_id)
-            if "activity_log" not in profile:
-                profile["activity_log"] = []
-            profile["activity_log"].append({
+            self._queue_event(user_id, "activity_log", {
                 "timestamp": datetime.utcnow().isoformat(),
                 "type": activity_type,
                 "details": details
             })
-            # Keep only last 100 activities
-            profile["activity_log"] = profile["activity_log"][-100:]
-            
-            # Update last_activity timestamp
-            profile["last_activity"] = datetime.utcnow().isoformat()
-            
-            self.update_user(user_id, profile)
             return True
         except Exception as e:
             self.logger.error(f"Error logging user activity: {e}")
@@ -171,10 +376,6 @@ class UserProfileManager:
                           result_summary: str = "") -> bool:
         """Log task execution"""
         try:
-            profile = self.get_user(user_id)
-            if "task_history" not in profile:
-                profile["task_history"] = []
-            
             task_data = {
                 "agent_type": agent_type,
                 "query": query,
@@ -185,15 +386,24 @@ class UserProfileManager:
                 "timestamp": datetime.utcnow().isoformat()
             }
             
-            profile["task_history"].append(task_data)
-            # Keep only last 100 tasks
-            profile["task_history"] = profile["task_history"][-100:]
-            self.update_user(user_id, profile)
+            self._queue_event(user_id, "task_history", task_data)
             return True
         except Exception as e:
             self.logger.error(f"Error logging task execution: {e}")
             return False
     
+    async def aget_user(self, user_id: str) -> Dict[str, Any]:
+        """get_user for async callers; the database I/O runs in a worker thread"""
+        return await asyncio.to_thread(self.get_user, user_id)
+    
+    async def aupdate_user(self, user_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """update_user for async callers; the database I/O runs in a worker thread"""
+        return await asyncio.to_thread(self.update_user, user_id, updates)
+    
+    async def aincrement_task_count(self, user_id: str, delta: int) -> Dict[str, Any]:
+        """increment_task_count for async callers; the database I/O runs in a worker thread"""
+        return await asyncio.to_thread(self.increment_task_count, user_id, delta)
+    
     def get_profile(self, user_id: str) -> Dict[str, Any]:
         """Alias for get_user for backward compatibility"""
         return self.get_user(user_id)
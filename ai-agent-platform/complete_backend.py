@@ -9,13 +9,17 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import os
+import time
 import asyncio
 import json
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from backend.keyword_routing import KeywordRouter
+
 # Create FastAPI app
 app = FastAPI(
     title="AI Agent Platform - Complete",
@@ -66,7 +70,13 @@ class RegisterRequest(BaseModel):
 
 # In-memory user storage (replace with database later)
 users_db = {}
-tasks_db = {}
+
+# Task results are capped; the oldest is evicted first
+TASKS_MAX_SIZE = 100_000
+USER_TASK_HISTORY = 10
+tasks_db: Dict[str, Dict[str, Any]] = {}
+# user_id -> ids of that user's most recent tasks, oldest first
+user_tasks_idx: Dict[str, deque] = defaultdict(lambda: deque(maxlen=USER_TASK_HISTORY))
 
 # Agent implementations
 class SearchAgent:
@@ -204,6 +214,42 @@ async def login(request: LoginRequest):
         "user": user
     }
 
+# Keyword routing, highest priority first: a query matching several rows goes to the earliest
+ROUTING_RULES = (
+    ("career", ("job", "career", "apply", "resume", "hiring")),
+    ("travel", ("flight", "hotel", "travel", "route", "transport")),
+    ("local", ("restaurant", "nearby", "local", "service")),
+    ("transaction", ("buy", "purchase", "shop", "product", "price")),
+)
+DEFAULT_AGENT = "search"
+_KEYWORD_ROUTER = KeywordRouter(ROUTING_RULES, DEFAULT_AGENT)
+
+# Agent results are reused for RESULT_CACHE_TTL seconds for the same query text.
+# Results echo the query, so only an exact repeat may share an entry.
+RESULT_CACHE_TTL = 300.0
+RESULT_CACHE_MAX_SIZE = 10_000
+_result_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+
+async def dispatch_agent(agent_name: str, query: str, query_lower: str) -> Any:
+    """Run the routed agent's matching capability"""
+    if agent_name not in agents:
+        return {"error": "No suitable agent found"}
+
+    agent = agents[agent_name]
+    if hasattr(agent, 'search') and 'search' in query_lower:
+        return await agent.search(query)
+    elif hasattr(agent, 'search_jobs') and any(k in query_lower for k in ["job", "career"]):
+        return await agent.search_jobs(query)
+    elif hasattr(agent, 'get_route') and 'travel' in query_lower:
+        # Parse travel query
+        return await agent.get_route("Berlin", "Munich", "train")
+    elif hasattr(agent, 'find_nearby'):
+        return await agent.find_nearby(query, "Berlin")
+    elif hasattr(agent, 'search_products'):
+        return await agent.search_products(query)
+    return {"message": f"Task processed by {agent_name} agent"}
+
 @app.post("/execute")
 async def execute_task(request: TaskRequest, user_id: Optional[str] = Depends(get_current_user_optional)):
     start_time = datetime.utcnow()
@@ -216,38 +262,19 @@ async def execute_task(request: TaskRequest, user_id: Optional[str] = Depends(ge
 
         # Route to appropriate agent
         query_lower = request.query.lower()
-        agent_name = "search"  # default
-
-        routing_rules = {
-            "career": ["job", "career", "apply", "resume", "hiring"],
-            "travel": ["flight", "hotel", "travel", "route", "transport"],
-            "local": ["restaurant", "nearby", "local", "service"],
-            "transaction": ["buy", "purchase", "shop", "product", "price"]
-        }
+        agent_name = _KEYWORD_ROUTER.route(request.query, query_lower)
 
-        for agent, keywords in routing_rules.items():
-            if any(keyword in query_lower for keyword in keywords):
-                agent_name = agent
-                break
-
-        # Execute task
-        if agent_name in agents:
-            agent = agents[agent_name]
-            if hasattr(agent, 'search') and 'search' in query_lower:
-                result = await agent.search(request.query)
-            elif hasattr(agent, 'search_jobs') and any(k in query_lower for k in ["job", "career"]):
-                result = await agent.search_jobs(request.query)
-            elif hasattr(agent, 'get_route') and 'travel' in query_lower:
-                # Parse travel query
-                result = await agent.get_route("Berlin", "Munich", "train")
-            elif hasattr(agent, 'find_nearby'):
-                result = await agent.find_nearby(request.query, "Berlin")
-            elif hasattr(agent, 'search_products'):
-                result = await agent.search_products(request.query)
-            else:
-                result = {"message": f"Task processed by {agent_name} agent"}
+        # Execute task, reusing the result of a recent equivalent query
+        cache_key = (agent_name, request.query.strip())
+        cached = _result_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            result = cached[1]
         else:
-            result = {"error": "No suitable agent found"}
+            result = await dispatch_agent(agent_name, request.query, query_lower)
+            if len(_result_cache) >= RESULT_CACHE_MAX_SIZE:
+                # Evict the oldest entry
+                _result_cache.pop(next(iter(_result_cache)), None)
+            _result_cache[cache_key] = (time.monotonic() + RESULT_CACHE_TTL, result)
 
         execution_time = (datetime.utcnow() - start_time).total_seconds()
 
@@ -261,7 +288,11 @@ async def execute_task(request: TaskRequest, user_id: Optional[str] = Depends(ge
             "execution_time": execution_time,
             "timestamp": start_time.isoformat()
         }
+        if len(tasks_db) >= TASKS_MAX_SIZE:
+            # Evict the oldest entry
+            tasks_db.pop(next(iter(tasks_db)), None)
         tasks_db[task_id] = task_data
+        user_tasks_idx[user_id].append(task_id)
 
         return TaskResponse(
             task_id=task_id,
@@ -284,8 +315,8 @@ async def execute_task(request: TaskRequest, user_id: Optional[str] = Depends(ge
 
 @app.get("/tasks")
 async def get_user_tasks(user_id: str = Depends(get_current_user_optional)):
-    user_tasks = [task for task in tasks_db.values() if task["user_id"] == user_id]
-    return {"tasks": user_tasks[-10:]}  # Last 10 tasks
+    task_ids = user_tasks_idx.get(user_id, ())
+    return {"tasks": [tasks_db[task_id] for task_id in task_ids if task_id in tasks_db]}  # Last 10 tasks
 
 @app.get("/agents")
 async def list_agents():
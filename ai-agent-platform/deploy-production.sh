@@ -34,4 +34,5 @@ echo ""
 
 # Run the application
 echo "🚀 Starting server..."
-uvicorn backend.main:app --host 0.0.0.0 --port $BACKEND_PORT
\ No newline at end of file
+uvicorn backend.main:app --host 0.0.0.0 --port $BACKEND_PORT \
+    --loop uvloop --http httptools --ws-ping-interval 20 --ws-ping-timeout 20
\ No newline at end of file
@@ -90,6 +90,9 @@ async def startup_event():
     await metrics.start_collection()
     logger.info("Metrics collection started")
 
+    # Relay WebSocket broadcasts across workers when Redis is configured
+    await ws_manager.start_backplane(os.getenv("REDIS_URL"))
+
     # Start background job processor
     asyncio.create_task(job_processor.process_jobs(max_concurrent=10))
     logger.info("Job processor started")
@@ -113,6 +116,7 @@ async def shutdown_event():
 
     await metrics.stop_collection()
     await job_processor.stop()
+    await ws_manager.stop_backplane()
 
     logger.info("Shutdown complete")
 
@@ -397,5 +401,14 @@ if __name__ == "__main__":
         port=port,
         reload=False,
         log_level="info",
-        access_log=True
+        access_log=True,
+        # loop/http stay on "auto", which picks uvloop and httptools from uvicorn[standard]
+        # and falls back to asyncio/h11 on Windows
+        loop="auto",
+        http="auto",
+        # Protocol-level keepalive, so clients do not need application ping messages
+        ws_ping_interval=20.0,
+        ws_ping_timeout=20.0,
+        # Broadcast frames are pre-compressed once in websockets.py for clients that opt in
+        ws_per_message_deflate=False
     )
\ No newline at end of file
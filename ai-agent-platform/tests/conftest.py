@@ -0,0 +1,53 @@
+"""
+Shared fixtures for the test suite
+Heavy agents are built once per session and reused across test classes.
+Agent modules are imported inside their fixtures so collecting tests that
+never request them does not pull in Playwright, Scrapy or JobSpy.
+"""
+
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    # uvloop does not support Windows
+    UVLOOP_AVAILABLE = False
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when it is installed"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def career_agent():
+    """Career agent shared by every test in the session"""
+    from agents.career import CareerAgent
+    return CareerAgent()
+
+
+@pytest.fixture(scope="session")
+def browser_job_agent():
+    """Browser job agent shared by every test in the session"""
+    from agents.browser_job_agent import BrowserJobAgent
+    return BrowserJobAgent()
+
+
+@pytest.fixture(scope="session")
+def scraper_agent():
+    """Job scraper agent shared by every test in the session"""
+    from agents.job_scraper import JobScraperAgent
+    return JobScraperAgent()
+
+
+@pytest.fixture(scope="session")
+def job_automation():
+    """Job automation shared by every test in the session"""
+    from agents.job_automation import JobAutomation
+    return JobAutomation()
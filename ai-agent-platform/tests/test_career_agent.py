@@ -10,7 +10,6 @@ from agents.career import career_agent
 class TestCareerAgent:
     """Test career agent functionality"""
 
-    @pytest.mark.asyncio
     async def test_search_jobs(self):
         """Test job search functionality"""
         jobs = await career_agent.search_jobs("Python Developer")
@@ -25,7 +24,6 @@ class TestCareerAgent:
             assert "url" in job
             assert "source" in job
 
-    @pytest.mark.asyncio
     async def test_analyze_job(self):
         """Test job analysis"""
         job = {
@@ -46,7 +44,6 @@ class TestCareerAgent:
         assert isinstance(result["match_score"], float)
         assert 0.0 <= result["match_score"] <= 1.0
 
-    @pytest.mark.asyncio
     async def test_auto_apply_structure(self):
         """Test auto-apply returns proper structure (without actually applying)"""
         job = {
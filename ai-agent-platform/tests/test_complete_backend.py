@@ -0,0 +1,33 @@
+"""
+Tests for the standalone complete backend
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+import complete_backend
+from complete_backend import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client fixture with an empty result cache"""
+    monkeypatch.setattr(complete_backend, "_result_cache", {})
+    return TestClient(app)
+
+
+def test_result_cache_keeps_punctuation_variants_apart(client):
+    """Test queries differing only in punctuation each get their own result"""
+    first = client.post("/execute", json={"query": "c++ developer job"}).json()
+    second = client.post("/execute", json={"query": "c# developer job"}).json()
+
+    assert first["result"]["query"] == "c++ developer job"
+    assert second["result"]["query"] == "c# developer job"
+
+
+def test_result_cache_reuses_exact_repeat(client):
+    """Test an exact repeat is served from the result cache"""
+    first = client.post("/execute", json={"query": "python developer job"}).json()
+    repeat = client.post("/execute", json={"query": "python developer job "}).json()
+
+    assert repeat["result"] == first["result"]
+    assert repeat["execution_time"] < first["execution_time"]
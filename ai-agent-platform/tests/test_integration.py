@@ -135,7 +135,6 @@ class TestCareerAgentIntegration:
                 else:
                     time.sleep(0.1)  # Wait before retry
 
-    @pytest.mark.asyncio
     async def test_auto_apply_with_tracking(self):
         """Test auto-apply functionality with database tracking"""
         user_id = "test_user_123"
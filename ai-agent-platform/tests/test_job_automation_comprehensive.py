@@ -6,155 +6,244 @@ Validates hybrid routing system and tool fallbacks
 
 import pytest
 import asyncio
-import json
-import tempfile
-import os
-from unittest.mock import Mock, patch, AsyncMock
-from typing import Dict, Any, List
-from datetime import datetime
-import pandas as pd
-
-# Import agents
-from agents.career import CareerAgent
-from agents.job_automation import JobAutomation
-from agents.job_scraper import JobScraperAgent
-from agents.browser_job_agent import BrowserJobAgent
-from agents.browser_advanced import AdvancedBrowserAgent
+import time
+import httpx
+import orjson
+import respx
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock, patch, AsyncMock, mock_open
+from typing import Dict, Any, List, Mapping, Tuple
+
+
+BULK_APPLY_BUDGET_NS = 10_000_000_000
+MAX_CONCURRENT_SEARCHES = 16
+
+TOOL_CONFIGS: Mapping[str, Mapping[str, Tuple[str, ...]]] = MappingProxyType({
+    "Browser-Use": MappingProxyType({
+        "strengths": ("form_filling", "interactive_elements", "llm_powered"),
+        "platforms": ("linkedin", "indeed", "complex_forms")
+    }),
+    "Skyvern": MappingProxyType({
+        "strengths": ("enterprise_automation", "complex_workflows"),
+        "platforms": ("linkedin", "greenhouse", "workday")
+    }),
+    "Crawl4AI": MappingProxyType({
+        "strengths": ("fast_scraping", "api_like_extraction"),
+        "platforms": ("remoteok", "weworkremotely", "simple_sites")
+    }),
+    "ScrapeGraphAI": MappingProxyType({
+        "strengths": ("intelligent_parsing", "structured_data"),
+        "platforms": ("indeed", "monster", "data_rich_sites")
+    })
+})
+
+# (platform, action[, complexity]) -> tool; the 3-key entries override the 2-key ones
+TOOL_SELECTION: Mapping[Tuple[str, ...], str] = MappingProxyType({
+    ("linkedin", "apply", "high"): "Browser-Use",
+    ("linkedin", "apply"): "Skyvern",
+    ("remoteok", "scrape"): "Crawl4AI",
+    ("weworkremotely", "scrape"): "Crawl4AI",
+    ("indeed", "scrape"): "ScrapeGraphAI"
+})
+
+ROUTING_CONFIG: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "linkedin": ("Browser-Use", "Skyvern"),
+    "indeed": ("ScrapeGraphAI", "Browser-Use"),
+    "remoteok": ("Crawl4AI", "Browser-Use")
+})
+
+SAMPLE_USER_PROFILE: Mapping[str, Any] = MappingProxyType({
+    "first_name": "John",
+    "last_name": "Doe",
+    "email": "john.doe@example.com",
+    "phone": "+1-555-0123",
+    "skills": ("Python", "Django", "React")
+})
+
+# Agent and API payloads, serialized once at import
+REMOTEOK_API_JSON = orjson.dumps([
+    {
+        "slug": "python-developer-123",
+        "title": "Python Developer",
+        "company": "Tech Corp",
+        "location": "Remote",
+        "salary": "$80k - $100k"
+    }
+]).decode()
+DEVOPS_JOBS_JSON = orjson.dumps([
+    {"title": "DevOps Engineer", "company": "Cloud Corp", "url": "https://linkedin.com/jobs/789"}
+]).decode()
+SINGLE_JOB_JSON = orjson.dumps([{"title": "Job 1", "company": "Company A"}]).decode()
+TITLE_ONLY_JOB_JSON = orjson.dumps([{"title": "Job 1"}]).decode()
+THREE_JOBS_JSON = orjson.dumps([
+    {"title": "Job 1", "company": "Company 1"},
+    {"title": "Job 2", "company": "Company 2"},
+    {"title": "Job 3", "company": "Company 3"}
+]).decode()
+
+LINKEDIN_JOB_ROW = {
+    "title": "Senior Python Developer",
+    "company": "Tech Corp",
+    "location": "San Francisco, CA",
+    "job_url": "https://linkedin.com/jobs/123",
+    "salary": "$120k - $150k",
+    "description": "Python development role",
+    "site": "linkedin",
+    "date_posted": "2024-01-01",
+    "is_remote": False
+}
+
+INDEED_JOB_ROW = {
+    "title": "Full Stack Engineer",
+    "company": "Startup Inc",
+    "location": "Remote",
+    "job_url": "https://indeed.com/jobs/456",
+    "salary": "$90k - $120k",
+    "description": "Full stack development",
+    "site": "indeed",
+    "date_posted": "2024-01-01",
+    "is_remote": True
+}
+
+
+@pytest.fixture(scope="module")
+def linkedin_jobs_df():
+    """Single-row JobSpy result for LinkedIn, built once per module"""
+    import pandas as pd
+    return pd.DataFrame([LINKEDIN_JOB_ROW])
+
+
+@pytest.fixture(scope="module")
+def indeed_jobs_df():
+    """Single-row JobSpy result for Indeed, built once per module"""
+    import pandas as pd
+    return pd.DataFrame([INDEED_JOB_ROW])
+
+
+@pytest.fixture
+def sample_user_profile():
+    """Read-only applicant profile shared by the application tests"""
+    return SAMPLE_USER_PROFILE
+
+
+@pytest.fixture(scope="module", params=[5, 50, 500])
+def bulk_jobs(request):
+    """Job batches of increasing size, generated once per size"""
+    return [{"title": f"Job {i}", "company": f"Company {i}", "url": f"https://example.com/{i}"}
+            for i in range(request.param)]
+
+
+@pytest.fixture(autouse=True)
+def instant_sleep(monkeypatch):
+    """Resolve the agents' human-like asyncio.sleep delays immediately"""
+    sleep = AsyncMock()
+    for module in ("agents.browser_job_agent", "agents.browser_advanced"):
+        monkeypatch.setattr(f"{module}.asyncio", SimpleNamespace(sleep=sleep))
+    return sleep
+
+
+@pytest.fixture(scope="module")
+def _browser_use_agent_factory():
+    """Stand-in for browser_use.Agent, constructed once per module"""
+    return Mock(return_value=AsyncMock())
+
+
+@pytest.fixture(autouse=True)
+def browser_use_agent(_browser_use_agent_factory, monkeypatch):
+    """Patch browser_use.Agent for every test; returns the agent instance to configure"""
+    _browser_use_agent_factory.reset_mock()
+    agent_instance = _browser_use_agent_factory.return_value
+    agent_instance.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr("agents.browser_job_agent.Agent", _browser_use_agent_factory)
+    return agent_instance
+
+
+@pytest.fixture(scope="module")
+def _browser_mocks():
+    """Browser method mocks, constructed once per module"""
+    return SimpleNamespace(
+        initialize=AsyncMock(),
+        navigate_and_wait=AsyncMock(),
+        click_button=AsyncMock(),
+        fill_form=AsyncMock(),
+        close=AsyncMock(),
+        page=Mock(query_selector=AsyncMock(), wait_for_timeout=AsyncMock())
+    )
+
+
+@pytest.fixture
+def browser_mock_graph(job_automation, _browser_mocks, monkeypatch):
+    """Install the shared browser mocks on job_automation.browser for one test"""
+    for name, mock in vars(_browser_mocks).items():
+        mock.reset_mock(return_value=True, side_effect=True)
+        monkeypatch.setattr(job_automation.browser, name, mock)
+    return _browser_mocks
 
 
 class TestJobSearchWorkflows:
     """Test job search across all major platforms"""
 
-    @pytest.fixture
-    def career_agent(self):
-        return CareerAgent()
-
-    @pytest.fixture
-    def browser_job_agent(self):
-        return BrowserJobAgent()
-
-    @pytest.fixture
-    def job_scraper(self):
-        return JobScraperAgent()
-
-    @pytest.mark.asyncio
-    async def test_linkedin_job_search(self, browser_job_agent):
-        """Test LinkedIn job search functionality"""
+    @pytest.mark.parametrize("jobs_df_fixture,title,location,max_results,url_sub", [
+        ("linkedin_jobs_df", "Python Developer", "San Francisco", 5, "linkedin.com"),
+        ("indeed_jobs_df", "Full Stack Engineer", "Remote", 3, "indeed.com"),
+    ], ids=["linkedin", "indeed"])
+    async def test_platform_job_search(self, request, browser_job_agent, jobs_df_fixture,
+                                       title, location, max_results, url_sub):
+        """Test LinkedIn and Indeed job search functionality"""
         with patch("agents.browser_job_agent.scrape_jobs") as mock_scrape:
-            # Mock the scrape_jobs function to return LinkedIn jobs
-            mock_df = pd.DataFrame([
-                {
-                    "title": "Senior Python Developer",
-                    "company": "Tech Corp",
-                    "location": "San Francisco, CA",
-                    "job_url": "https://linkedin.com/jobs/123",
-                    "salary": "$120k - $150k",
-                    "description": "Python development role",
-                    "site": "linkedin",
-                    "date_posted": "2024-01-01",
-                    "is_remote": False
-                }
-            ])
-            mock_scrape.return_value = mock_df
+            # Mock the scrape_jobs function to return the platform's jobs
+            mock_scrape.return_value = request.getfixturevalue(jobs_df_fixture)
 
             results = await browser_job_agent.search_jobs(
-                title="Python Developer",
-                location="San Francisco",
-                max_results=5
+                title=title,
+                location=location,
+                max_results=max_results
             )
 
             assert results["status"] == "success"
             assert len(results["jobs"]) > 0
             assert results["searched_platforms"] >= 1
-            assert "linkedin.com" in str(results["jobs"][0]["url"])
-
-    @pytest.mark.asyncio
-    async def test_indeed_job_search(self, browser_job_agent):
-        """Test Indeed job search functionality"""
-        with patch("agents.browser_job_agent.scrape_jobs") as mock_scrape:
-            mock_df = pd.DataFrame([
-                {
-                    "title": "Full Stack Engineer",
-                    "company": "Startup Inc",
-                    "location": "Remote",
-                    "job_url": "https://indeed.com/jobs/456",
-                    "salary": "$90k - $120k",
-                    "description": "Full stack development",
-                    "site": "indeed",
-                    "date_posted": "2024-01-01",
-                    "is_remote": True
-                }
-            ])
-            mock_scrape.return_value = mock_df
+            url = results["jobs"][0]["url"]
+            assert isinstance(url, str)
+            assert url_sub in url
 
-            results = await browser_job_agent.search_jobs(
-                title="Full Stack Engineer",
-                location="Remote",
-                max_results=3
-            )
-
-            assert results["status"] == "success"
-            assert "indeed.com" in str(results["jobs"][0]["url"])
-
-    @pytest.mark.asyncio
+    @respx.mock
     async def test_remoteok_job_search(self, career_agent):
         """Test RemoteOK job search via career agent"""
-        mock_jobs = [
-            {
-                "slug": "python-developer-123",
-                "title": "Python Developer",
-                "company": "Tech Corp",
-                "location": "Remote",
-                "salary": "$80k - $100k"
-            }
-        ]
-        
-        with patch("httpx.AsyncClient") as mock_client:
-            mock_response = AsyncMock()
-            mock_response.text = json.dumps(mock_jobs)
-            mock_response.raise_for_status = Mock()
-            
-            mock_client.return_value.__aenter__.return_value.get.return_value = mock_response
-            
-            jobs = await career_agent.search_jobs("Python Developer")
-
-            # Should return jobs
-            assert isinstance(jobs, list)
-            assert len(jobs) == 1
-            job = jobs[0]
-            assert job["title"] == "Python Developer"
-            assert job["company"] == "Tech Corp"
-            assert "url" in job
-            assert job.get("source") == "RemoteOK"
+        route = respx.get("https://remoteok.com/api", params={"tag": "python-developer"}).mock(
+            return_value=httpx.Response(200, text=REMOTEOK_API_JSON)
+        )
 
-    @pytest.mark.asyncio
-    async def test_multi_platform_search(self, browser_job_agent):
+        jobs = await career_agent.search_jobs("Python Developer")
+
+        assert route.called
+        # Should return jobs
+        assert isinstance(jobs, list)
+        assert len(jobs) == 1
+        job = jobs[0]
+        assert job["title"] == "Python Developer"
+        assert job["company"] == "Tech Corp"
+        assert "url" in job
+        assert job.get("source") == "RemoteOK"
+
+    async def test_multi_platform_search(self, browser_job_agent, browser_use_agent):
         """Test searching across multiple platforms simultaneously"""
-        with patch("agents.browser_job_agent.Agent") as mock_agent:
-            mock_agent_instance = AsyncMock()
-            mock_agent.return_value = mock_agent_instance
-            mock_agent_instance.run.return_value = Mock(extracted_content=json.dumps([
-                {"title": "DevOps Engineer", "company": "Cloud Corp", "url": "https://linkedin.com/jobs/789"}
-            ]))
+        browser_use_agent.run.return_value = Mock(extracted_content=DEVOPS_JOBS_JSON)
 
-            results = await browser_job_agent.search_jobs(
-                title="DevOps Engineer",
-                location="New York",
-                max_results=10
-            )
+        results = await browser_job_agent.search_jobs(
+            title="DevOps Engineer",
+            location="New York",
+            max_results=10
+        )
 
-            assert results["status"] == "success"
-            assert results["total_found"] >= 0
-            assert results["searched_platforms"] >= 1
+        assert results["status"] == "success"
+        assert results["total_found"] >= 0
+        assert results["searched_platforms"] >= 1
 
 
 class TestJobScrapingWorkflows:
     """Test job scraping functionality"""
 
-    @pytest.fixture
-    def scraper_agent(self):
-        return JobScraperAgent()
-
     def test_remoteok_scraping(self, scraper_agent):
         """Test RemoteOK job scraping"""
         jobs = scraper_agent.scrape_jobs(platforms=["remoteok"])
@@ -206,16 +295,17 @@ class TestJobScrapingWorkflows:
 
     def test_scraper_output_file(self, scraper_agent):
         """Test saving scraped results to file"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            output_file = os.path.join(temp_dir, "jobs.json")
+        output_file = "/scraper_output/jobs.json"
 
-            jobs = scraper_agent.run_scraper("remoteok", output_file)
+        with patch("agents.job_scraper.os.makedirs") as mock_makedirs, \
+             patch("builtins.open", mock_open()) as mock_file:
 
-            assert os.path.exists(output_file)
+            jobs = scraper_agent.run_scraper("remoteok", output_file)
 
-            with open(output_file, "r") as f:
-                saved_jobs = json.load(f)
+            mock_makedirs.assert_called_once_with("/scraper_output", exist_ok=True)
+            mock_file.assert_called_once_with(output_file, "wb")
 
+            saved_jobs = orjson.loads(mock_file().write.call_args.args[0])
             assert len(saved_jobs) == len(jobs)
 
 
@@ -223,56 +313,32 @@ class TestJobApplicationWorkflows:
     """Test job application automation"""
 
     @pytest.fixture
-    def job_automation(self):
-        return JobAutomation()
+    def browser_agent(self, browser_job_agent):
+        return browser_job_agent
 
-    @pytest.fixture
-    def browser_agent(self):
-        return BrowserJobAgent()
-
-    @pytest.fixture
-    def sample_user_profile(self):
-        return {
-            "first_name": "John",
-            "last_name": "Doe",
-            "email": "john.doe@example.com",
-            "phone": "+1-555-0123",
-            "skills": ["Python", "Django", "React"]
-        }
-
-    @pytest.mark.asyncio
-    async def test_linkedin_easy_apply(self, job_automation, sample_user_profile):
+    async def test_linkedin_easy_apply(self, job_automation, sample_user_profile, browser_mock_graph):
         """Test LinkedIn Easy Apply automation"""
         job_url = "https://linkedin.com/jobs/view/123"
 
-        with patch.object(job_automation.browser, "initialize", new_callable=AsyncMock), \
-             patch.object(job_automation.browser, "navigate_and_wait", new_callable=AsyncMock) as mock_navigate, \
-             patch.object(job_automation.browser, "click_button", new_callable=AsyncMock) as mock_click, \
-             patch.object(job_automation.browser, "fill_form", new_callable=AsyncMock) as mock_fill, \
-             patch.object(job_automation.browser, "close", new_callable=AsyncMock), \
-             patch.object(job_automation.browser, "page") as mock_page:
-
-            mock_navigate.return_value = True
-
-            # Mock page methods
-            submit_button = Mock()
-            submit_button.click = AsyncMock()
-            
-            def mock_query_selector(selector):
-                if 'Submit application' in selector:
-                    return submit_button
-                return None
-            
-            mock_page.query_selector = AsyncMock(side_effect=mock_query_selector)
-            mock_page.wait_for_timeout = AsyncMock()
-
-            result = await job_automation.auto_apply_linkedin(job_url, sample_user_profile)
-
-            assert result["status"] == "success"
-            assert result["platform"] == "LinkedIn"
-            assert result["job_url"] == job_url
-
-    @pytest.mark.asyncio
+        browser_mock_graph.navigate_and_wait.return_value = True
+
+        # Mock page methods
+        submit_button = Mock()
+        submit_button.click = AsyncMock()
+
+        def mock_query_selector(selector):
+            if 'Submit application' in selector:
+                return submit_button
+            return None
+
+        browser_mock_graph.page.query_selector.side_effect = mock_query_selector
+
+        result = await job_automation.auto_apply_linkedin(job_url, sample_user_profile)
+
+        assert result["status"] == "success"
+        assert result["platform"] == "LinkedIn"
+        assert result["job_url"] == job_url
+
     async def test_bulk_job_application(self, job_automation, sample_user_profile):
         """Test applying to multiple jobs"""
         jobs = [
@@ -293,8 +359,7 @@ class TestJobApplicationWorkflows:
             assert results["failed"] == 1
             assert len(results["details"]) == 2
 
-    @pytest.mark.asyncio
-    async def test_browser_agent_job_application(self, browser_agent):
+    async def test_browser_agent_job_application(self, browser_agent, browser_use_agent):
         """Test job application via browser agent"""
         job = {
             "title": "Software Engineer",
@@ -302,18 +367,14 @@ class TestJobApplicationWorkflows:
             "url": "https://linkedin.com/jobs/123"
         }
 
-        with patch("agents.browser_job_agent.Agent") as mock_agent:
-            mock_agent_instance = AsyncMock()
-            mock_agent.return_value = mock_agent_instance
-            mock_agent_instance.run.return_value = None
+        browser_use_agent.run.return_value = None
 
-            result = await browser_agent.apply_to_job(job)
+        result = await browser_agent.apply_to_job(job)
 
-            assert result["status"] == "applied"
-            assert result["job"] == job["title"]
-            assert result["company"] == job["company"]
+        assert result["status"] == "applied"
+        assert result["job"] == job["title"]
+        assert result["company"] == job["company"]
 
-    @pytest.mark.asyncio
     async def test_bulk_browser_applications(self, browser_agent):
         """Test bulk applications with browser agent"""
         jobs = [
@@ -327,7 +388,7 @@ class TestJobApplicationWorkflows:
                 {"status": "applied", "job": "Dev 2", "company": "Company B"}
             ]
 
-            results = await browser_agent.bulk_apply(jobs, delay=1)
+            results = await browser_agent.bulk_apply(jobs, delay=0)
 
             assert results["status"] == "completed"
             assert results["total_jobs"] == 2
@@ -361,51 +422,25 @@ class TestHybridRoutingSystem:
     def test_tool_selection_logic(self):
         """Test logic for selecting appropriate tool based on task"""
         # This would be implemented in a hybrid router
-        tool_configs = {
-            "Browser-Use": {
-                "strengths": ["form_filling", "interactive_elements", "llm_powered"],
-                "platforms": ["linkedin", "indeed", "complex_forms"]
-            },
-            "Skyvern": {
-                "strengths": ["enterprise_automation", "complex_workflows"],
-                "platforms": ["linkedin", "greenhouse", "workday"]
-            },
-            "Crawl4AI": {
-                "strengths": ["fast_scraping", "api_like_extraction"],
-                "platforms": ["remoteok", "weworkremotely", "simple_sites"]
-            },
-            "ScrapeGraphAI": {
-                "strengths": ["intelligent_parsing", "structured_data"],
-                "platforms": ["indeed", "monster", "data_rich_sites"]
-            }
-        }
-
         # Test tool selection for LinkedIn application
         task = {"platform": "linkedin", "action": "apply", "complexity": "high"}
-        selected_tool = self._select_tool_for_task(task, tool_configs)
+        selected_tool = self._select_tool_for_task(task, TOOL_CONFIGS)
         assert selected_tool in ["Browser-Use", "Skyvern"]
 
         # Test tool selection for RemoteOK scraping
         task = {"platform": "remoteok", "action": "scrape", "complexity": "low"}
-        selected_tool = self._select_tool_for_task(task, tool_configs)
+        selected_tool = self._select_tool_for_task(task, TOOL_CONFIGS)
         assert selected_tool == "Crawl4AI"
 
-    def _select_tool_for_task(self, task: Dict, tool_configs: Dict) -> str:
+    def _select_tool_for_task(self, task: Dict, tool_configs: Mapping) -> str:
         """Mock tool selection logic"""
         platform = task.get("platform", "").lower()
         action = task.get("action", "")
         complexity = task.get("complexity", "medium")
 
-        if platform == "linkedin" and action == "apply":
-            return "Browser-Use" if complexity == "high" else "Skyvern"
-        elif platform in ["remoteok", "weworkremotely"] and action == "scrape":
-            return "Crawl4AI"
-        elif platform == "indeed" and action == "scrape":
-            return "ScrapeGraphAI"
-        else:
-            return "Browser-Use"  # Default fallback
+        return (TOOL_SELECTION.get((platform, action, complexity))
+                or TOOL_SELECTION.get((platform, action), "Browser-Use"))  # Default fallback
 
-    @pytest.mark.asyncio
     async def test_tool_fallback_mechanism(self, mock_browser_use, mock_skyvern):
         """Test fallback when primary tool fails"""
         # Simulate Browser-Use failing
@@ -432,15 +467,8 @@ class TestHybridRoutingSystem:
         except Exception:
             return await tools["fallback"](action, params)
 
-    @pytest.mark.asyncio
     async def test_tool_routing_integration(self, mock_browser_use, mock_skyvern, mock_crawl4ai):
         """Test integrated tool routing for different platforms"""
-        routing_config = {
-            "linkedin": ["Browser-Use", "Skyvern"],
-            "indeed": ["ScrapeGraphAI", "Browser-Use"],
-            "remoteok": ["Crawl4AI", "Browser-Use"]
-        }
-
         tools = {
             "Browser-Use": mock_browser_use,
             "Skyvern": mock_skyvern,
@@ -451,16 +479,16 @@ class TestHybridRoutingSystem:
         result = await self._route_and_execute(
             platform="linkedin",
             action="apply",
-            routing_config=routing_config,
+            routing_config=ROUTING_CONFIG,
             tools=tools
         )
 
         assert mock_browser_use.called or mock_skyvern.called
 
     async def _route_and_execute(self, platform: str, action: str,
-                               routing_config: Dict, tools: Dict) -> Dict:
+                               routing_config: Mapping, tools: Dict) -> Dict:
         """Mock routing and execution"""
-        available_tools = routing_config.get(platform, ["Browser-Use"])
+        available_tools = routing_config.get(platform, ("Browser-Use",))
 
         for tool_name in available_tools:
             tool = tools.get(tool_name)
@@ -476,76 +504,39 @@ class TestHybridRoutingSystem:
 class TestErrorHandlingAndRecovery:
     """Test error handling and recovery mechanisms"""
 
-    @pytest.fixture
-    def browser_job_agent(self):
-        return BrowserJobAgent()
-
-    @pytest.fixture
-    def scraper_agent(self):
-        return JobScraperAgent()
-
-    @pytest.fixture
-    def job_automation(self):
-        return JobAutomation()
-
-    @pytest.fixture
-    def browser_agent(self):
-        return AdvancedBrowserAgent()
-
-    @pytest.fixture
-    def sample_user_profile(self):
-        return {
-            "first_name": "John",
-            "last_name": "Doe",
-            "email": "john.doe@example.com",
-            "phone": "+1-555-0123",
-            "skills": ["Python", "Django", "React"]
-        }
-
-    @pytest.mark.asyncio
-    async def test_network_failure_recovery(self, browser_job_agent):
+    async def test_network_failure_recovery(self, browser_job_agent, browser_use_agent):
         """Test recovery from network failures"""
-        with patch("agents.browser_job_agent.Agent") as mock_agent:
-            mock_agent_instance = AsyncMock()
-            mock_agent.return_value = mock_agent_instance
-
-            # First call fails with network error
-            mock_agent_instance.run.side_effect = [
-                Exception("Network timeout"),
-                Mock(extracted_content=json.dumps([{"title": "Job 1", "company": "Company A"}]))
-            ]
+        # First call fails with network error
+        browser_use_agent.run.side_effect = [
+            Exception("Network timeout"),
+            Mock(extracted_content=SINGLE_JOB_JSON)
+        ]
 
-            # Should retry and succeed
-            results = await browser_job_agent.search_jobs("developer", "remote")
+        # Should retry and succeed
+        results = await browser_job_agent.search_jobs("developer", "remote")
 
-            assert results["status"] == "success"
-            assert len(results["jobs"]) > 0
+        assert results["status"] == "success"
+        assert len(results["jobs"]) > 0
 
-    @pytest.mark.asyncio
-    async def test_platform_rate_limiting(self, browser_job_agent):
+    async def test_platform_rate_limiting(self, browser_job_agent, browser_use_agent):
         """Test handling of platform rate limits"""
-        with patch("agents.browser_job_agent.Agent") as mock_agent:
-            mock_agent_instance = AsyncMock()
-            mock_agent.return_value = mock_agent_instance
-
-            # Simulate rate limiting
-            mock_agent_instance.run.side_effect = [
-                Exception("Rate limit exceeded"),
-                Exception("Rate limit exceeded"),
-                Mock(extracted_content=json.dumps([{"title": "Job 1"}]))
-            ]
+        # Simulate rate limiting
+        browser_use_agent.run.side_effect = [
+            Exception("Rate limit exceeded"),
+            Exception("Rate limit exceeded"),
+            Mock(extracted_content=TITLE_ONLY_JOB_JSON)
+        ]
 
-            results = await browser_job_agent.search_jobs("engineer", "san francisco")
+        results = await browser_job_agent.search_jobs("engineer", "san francisco")
 
-            # Should eventually succeed after retries
-            assert results["status"] == "success"
+        # Should eventually succeed after retries
+        assert results["status"] == "success"
 
     def test_invalid_platform_handling(self, scraper_agent):
         """Test handling of invalid platforms"""
         with pytest.raises(ValueError):
             scraper_agent.run_scraper("invalid_platform")
 
-    @pytest.mark.asyncio
     async def test_partial_failure_bulk_apply(self, job_automation, sample_user_profile):
         """Test bulk apply with some failures"""
         jobs = [
@@ -571,61 +562,44 @@ class TestErrorHandlingAndRecovery:
 class TestPerformanceAndScalability:
     """Test performance and scalability aspects"""
 
-    @pytest.fixture
-    def browser_job_agent(self):
-        return BrowserJobAgent()
-
-    @pytest.fixture
-    def browser_agent(self):
-        return BrowserJobAgent()
-
-    @pytest.fixture
-    def scraper_agent(self):
-        return JobScraperAgent()
-
-    @pytest.mark.asyncio
-    async def test_concurrent_job_searches(self, browser_job_agent):
+    @pytest.mark.parametrize("n_tasks", [1, 8, 64])
+    async def test_concurrent_job_searches(self, browser_job_agent, browser_use_agent,
+                                           linkedin_jobs_df, n_tasks):
         """Test concurrent job searches across platforms"""
-        search_tasks = [
-            browser_job_agent.search_jobs(f"developer_{i}", "remote", 5)
-            for i in range(3)
-        ]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
 
-        with patch("agents.browser_job_agent.Agent") as mock_agent:
-            mock_agent_instance = AsyncMock()
-            mock_agent.return_value = mock_agent_instance
-            mock_agent_instance.run.return_value = Mock(extracted_content=json.dumps([
-                {"title": "Job 1", "company": "Company 1"},
-                {"title": "Job 2", "company": "Company 2"},
-                {"title": "Job 3", "company": "Company 3"}
-            ]))
+        async def bounded_search(i):
+            async with semaphore:
+                return await browser_job_agent.search_jobs(f"developer_{i}", "remote", 5)
 
-            results = await asyncio.gather(*search_tasks, return_exceptions=True)
+        browser_use_agent.run.return_value = Mock(extracted_content=THREE_JOBS_JSON)
 
+        with patch("agents.browser_job_agent.scrape_jobs", return_value=linkedin_jobs_df):
+            results = await asyncio.gather(
+                *(bounded_search(i) for i in range(n_tasks)),
+                return_exceptions=True
+            )
+
+            assert len(results) == n_tasks
             # All should succeed
             for result in results:
                 if not isinstance(result, Exception):
                     assert result["status"] == "success"
 
-    @pytest.mark.asyncio
-    async def test_bulk_application_performance(self, browser_agent):
+    async def test_bulk_application_performance(self, browser_job_agent, bulk_jobs):
         """Test performance of bulk applications"""
-        jobs = [{"title": f"Job {i}", "company": f"Company {i}", "url": f"https://example.com/{i}"}
-               for i in range(5)]
+        start_ns = time.perf_counter_ns()
 
-        start_time = datetime.utcnow()
-
-        with patch.object(browser_agent, "apply_to_job", new_callable=AsyncMock) as mock_apply:
+        with patch.object(browser_job_agent, "apply_to_job", new_callable=AsyncMock) as mock_apply:
             mock_apply.return_value = {"status": "applied"}
 
-            results = await browser_agent.bulk_apply(jobs, delay=0.1)  # Minimal delay
+            results = await browser_job_agent.bulk_apply(bulk_jobs, delay=0)
 
-            end_time = datetime.utcnow()
-            duration = (end_time - start_time).total_seconds()
+            duration_ns = time.perf_counter_ns() - start_ns
 
-            assert results["successful_applications"] == 5
-            # Should complete within reasonable time (allowing for delays)
-            assert duration < 10
+            assert results["successful_applications"] == len(bulk_jobs)
+            # Should complete within reasonable time
+            assert duration_ns < BULK_APPLY_BUDGET_NS
 
     def test_memory_usage_scraping(self, scraper_agent):
         """Test memory usage during large-scale scraping"""
@@ -0,0 +1,96 @@
+"""
+Tests for the main_final execute endpoint
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+import backend.main_final as main_final
+from agents.orchestrator_advanced import AgentRouting
+
+
+@pytest.fixture
+def client():
+    """Test client fixture"""
+    return TestClient(main_final.app)
+
+
+def route_to(monkeypatch, agent, confidence):
+    """Make the orchestrator pick one agent with a fixed confidence"""
+    async def analyze_with_ai(query, context=None):
+        return AgentRouting(agent=agent, confidence=confidence, reasoning="test")
+
+    monkeypatch.setattr(main_final.advanced_orchestrator, "analyze_with_ai", analyze_with_ai)
+
+
+def stub_agent(monkeypatch, agent_type, payload=None, delay=0.0, error=None):
+    """Replace an agent handler with one that answers after delay, or raises"""
+    async def handler(request):
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return payload
+
+    monkeypatch.setitem(main_final.AGENT_DISPATCH, agent_type, handler)
+
+
+def test_confident_routing_uses_one_agent(client, monkeypatch):
+    """Test a confident routing returns that agent's own payload"""
+    route_to(monkeypatch, "career", 0.9)
+    stub_agent(monkeypatch, "career", {"jobs_found": 1, "jobs": ["python developer"]})
+    stub_agent(monkeypatch, "search", error=AssertionError("search must not run"))
+
+    response = client.post("/api/v1/execute", json={"query": "python jobs", "unknown_field": 1})
+    data = response.json()
+
+    assert response.status_code == 200
+    assert data["agent_used"] == "career"
+    assert data["result"] == {"jobs_found": 1, "jobs": ["python developer"]}
+    assert "additional_results" not in data
+    assert data["task_id"].startswith("task_")
+    assert isinstance(data["timestamp"], str)
+
+
+def test_unsure_routing_fans_out_in_agent_order(client, monkeypatch):
+    """Test a low-confidence routing keeps the routed agent first and the others in fan-out order"""
+    route_to(monkeypatch, "travel", 0.4)
+    stub_agent(monkeypatch, "travel", error=RuntimeError("no route"))
+    stub_agent(monkeypatch, "search", {"results": ["search"]}, delay=0.05)
+    stub_agent(monkeypatch, "career", {"jobs": ["career"]})
+    stub_agent(monkeypatch, "local", {"places": ["local"]}, delay=0.02)
+
+    data = client.post("/api/v1/execute", json={"query": "something vague"}).json()
+
+    # travel failed, so the first answering agent in fan-out order becomes the result
+    assert data["agent_used"] == "search"
+    assert data["result"] == {"results": ["search"]}
+    assert list(data["additional_results"]) == ["career", "local"]
+
+
+def test_unsure_routing_keeps_routed_agent_result(client, monkeypatch):
+    """Test the routed agent's payload stays the result when it answers during fan-out"""
+    route_to(monkeypatch, "career", 0.5)
+    stub_agent(monkeypatch, "career", {"jobs": ["career"]}, delay=0.05)
+    stub_agent(monkeypatch, "search", {"results": ["search"]})
+    stub_agent(monkeypatch, "local", {"places": ["local"]})
+
+    data = client.post("/api/v1/execute", json={"query": "something vague"}).json()
+
+    assert data["agent_used"] == "career"
+    assert data["result"] == {"jobs": ["career"]}
+    assert list(data["additional_results"]) == ["search", "local"]
+
+
+def test_cors_preflight_allow_list(client):
+    """Test preflight requests are answered only for configured origins and cached by the browser"""
+    allowed = client.options("/api/v1/execute", headers={
+        "Origin": "http://localhost:3000", "Access-Control-Request-Method": "POST"
+    })
+    blocked = client.options("/api/v1/execute", headers={
+        "Origin": "https://evil.example", "Access-Control-Request-Method": "POST"
+    })
+
+    assert allowed.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert allowed.headers["access-control-max-age"] == "86400"
+    assert "access-control-allow-origin" not in blocked.headers
@@ -0,0 +1,119 @@
+import json
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from backend.user_profiles import HISTORY_LIMIT, PROFILE_FLUSH_INTERVAL, UserProfileManager
+
+
+class TestProfileStore:
+    """Test the SQLite profile store, its event table and the legacy JSON import"""
+
+    def setup_method(self):
+        """Setup an isolated data directory"""
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.data_dir = self.tmp_dir / "user_profiles"
+        self.data_dir.mkdir()
+        self.managers = []
+
+    def teardown_method(self):
+        """Flush buffered events before removing the database"""
+        for manager in self.managers:
+            manager.flush()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _manager(self):
+        manager = UserProfileManager(data_dir=str(self.data_dir))
+        self.managers.append(manager)
+        return manager
+
+    def _write_legacy_profile(self, user_id, requests):
+        profile = {"user_id": user_id, "subscription": "pro", "requests": requests}
+        (self.data_dir / f"{user_id}.json").write_text(json.dumps(profile), encoding="utf-8")
+
+    def test_legacy_json_import(self):
+        """Test per-user JSON files are imported into an empty database"""
+        self._write_legacy_profile("legacy_user", [{"query": "old query"}])
+
+        profile = self._manager().get_user("legacy_user")
+
+        assert profile["subscription"] == "pro"
+        assert profile["requests"] == [{"query": "old query"}]
+
+    def test_inline_history_moves_to_event_table(self):
+        """Test inline history lists are moved out of the profile blob on first read"""
+        self._write_legacy_profile("legacy_user", [{"query": "first"}, {"query": "second"}])
+        manager = self._manager()
+
+        manager.get_user("legacy_user")
+
+        conn = sqlite3.connect(str(manager.db_path))
+        try:
+            stored = json.loads(conn.execute(
+                "SELECT profile_data FROM users WHERE user_id = 'legacy_user'"
+            ).fetchone()[0])
+            events = conn.execute(
+                "SELECT kind, entry FROM profile_events WHERE user_id = 'legacy_user' ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+        assert "requests" not in stored
+        assert [(kind, json.loads(entry)["query"]) for kind, entry in events] == [
+            ("requests", "first"), ("requests", "second")
+        ]
+
+    def test_history_trimmed_to_limit(self):
+        """Test each history list keeps only the newest HISTORY_LIMIT events"""
+        manager = self._manager()
+        for i in range(HISTORY_LIMIT + 30):
+            manager.add_request("busy_user", f"query {i}", "search", {"status": "success"})
+        manager.flush()
+
+        requests = manager.get_user("busy_user")["requests"]
+
+        assert len(requests) == HISTORY_LIMIT
+        assert requests[0]["query"] == "query 30"
+        assert requests[-1]["query"] == f"query {HISTORY_LIMIT + 29}"
+
+    def test_events_visible_before_flush(self):
+        """Test buffered events show up in get_user before the timer flushes them"""
+        manager = self._manager()
+
+        manager.log_task_execution("new_user", "career", "find jobs", "career_agent", True, 1.5)
+        manager.log_user_activity("new_user", "login", "User logged in")
+        profile = manager.get_user("new_user")
+
+        assert len(profile["task_history"]) == 1
+        assert profile["last_activity"] == profile["activity_log"][-1]["timestamp"]
+
+    def test_timer_flush_persists_events(self):
+        """Test the flush timer writes buffered events for other readers"""
+        manager = self._manager()
+
+        manager.log_user_activity("timer_user", "login", "User logged in")
+        time.sleep(PROFILE_FLUSH_INTERVAL * 3)
+
+        reader = UserProfileManager(db_path=str(manager.db_path))
+        self.managers.append(reader)
+        assert len(reader.get_user("timer_user")["activity_log"]) == 1
+
+    def test_cached_profile_dropped_on_write(self):
+        """Test repeat reads share the cached profile until a write replaces it"""
+        manager = self._manager()
+        manager.update_user("cached_user", {"email": "old@example.com"})
+
+        first = manager.get_user("cached_user")
+        assert manager.get_user("cached_user") is first
+
+        manager.update_user("cached_user", {"email": "new@example.com"})
+        assert manager.get_user("cached_user")["email"] == "new@example.com"
+
+    def test_explicit_db_path_skips_legacy_import(self):
+        """Test a manager given its own database does not import the default JSON directory"""
+        self._write_legacy_profile("legacy_user", [])
+        manager = UserProfileManager(data_dir=str(self.data_dir), db_path=str(self.tmp_dir / "other.db"))
+        self.managers.append(manager)
+
+        assert manager.get_all_users() == []
@@ -4,24 +4,250 @@ Real-time task updates, notifications, and live agent interactions
 """
 
 from fastapi import WebSocket, WebSocketDisconnect, APIRouter, Depends
-from typing import Dict, List, Set
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field, is_dataclass
 import json
+import os
 import asyncio
+import time
+import uuid
+import zlib
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Per-socket send timeout and outbound queue bound for broadcasts
+BROADCAST_SEND_TIMEOUT = 5.0
+OUTBOX_MAX_SIZE = 256
+
+# Echo every client message back; debugging aid, off unless WS_ECHO=1
+ECHO_ENABLED = os.getenv("WS_ECHO") == "1"
+
+# Opt-in pre-compressed binary frames: b"Z" + 4-byte big-endian length + zlib body
+COMPRESSED_FRAME_MAGIC = b"Z"
+COMPRESSION_LEVEL = 6
+
+# Opt-in batching: queued text broadcasts are coalesced into one
+# {"type": "batch", "messages": [...]} frame of at most BATCH_MAX_BYTES
+BATCH_MAX_BYTES = 64 * 1024
+
+# Redis pub/sub backplane: channel "general" is published on "ws:general".
+# Each payload is prefixed with the 32-char id of the publishing worker.
+BACKPLANE_PREFIX = "ws:"
+BACKPLANE_POLL_TIMEOUT = 1.0
+
+
+# How long the echo path may reuse a formatted timestamp
+TIMESTAMP_CACHE_SECONDS = 0.05
+_timestamp_cache: List = [0.0, ""]
+
+# Last agent_status broadcast as (agent, status, active_users, timestamp) -> payload;
+# agents re-announce the same status at high rate, so repeats reuse one encoded string
+_agent_status_cache: List = [None, ""]
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string"""
+    return datetime.utcnow().isoformat()
+
+
+def _now_iso_cached() -> str:
+    """Current UTC time, reformatted at most every TIMESTAMP_CACHE_SECONDS for high-rate paths"""
+    now = time.monotonic()
+    if now >= _timestamp_cache[0]:
+        _timestamp_cache[0] = now + TIMESTAMP_CACHE_SECONDS
+        _timestamp_cache[1] = _now_iso()
+    return _timestamp_cache[1]
+
+
+def _serialize(message: Any) -> str:
+    """Encode a message dict or event once so it can be sent as the same text frame to many sockets"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+    if is_dataclass(message):
+        message = asdict(message)
+    return json.dumps(message)
+
+
+def _deserialize(raw: Union[str, bytes]) -> Dict:
+    """Decode a client message from either a text or a binary frame"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _compress(payload: str) -> bytes:
+    """Compress a serialized message once for every client that asked for compressed frames"""
+    body = zlib.compress(payload.encode(), COMPRESSION_LEVEL)
+    return COMPRESSED_FRAME_MAGIC + len(body).to_bytes(4, "big") + body
+
+
+def _coalesce(first: str, queue: asyncio.Queue) -> str:
+    """Drain already-queued text payloads into one batch frame"""
+    batch = [first]
+    size = len(first)
+    while size < BATCH_MAX_BYTES:
+        try:
+            payload = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        batch.append(payload)
+        size += len(payload)
+
+    if len(batch) == 1:
+        return first
+    return '{"type":"batch","messages":[' + ",".join(batch) + "]}"
+
+# Broadcast events; orjson encodes slotted dataclasses directly, in field order
+@dataclass(slots=True)
+class TaskUpdate:
+    """Task status change sent to the task owner and the tasks channel"""
+    type: str = field(default="task_update", init=False)
+    task_id: str
+    status: str
+    user_id: str
+    timestamp: str
+
+
+@dataclass(slots=True)
+class TaskResultUpdate(TaskUpdate):
+    """Task status change that carries the task result"""
+    result: Dict
+
+
+@dataclass(slots=True)
+class AgentStatus:
+    """Agent status announcement for the agents channel"""
+    type: str = field(default="agent_status", init=False)
+    agent: str
+    status: str
+    active_users: int
+    timestamp: str
+
+
+@dataclass(slots=True)
+class SystemNotification:
+    """System-wide notification for the system channel"""
+    type: str = field(default="system_notification", init=False)
+    title: str
+    message: str
+    level: str  # info, warning, error, success
+    timestamp: str
+
+
+# Shared stand-in for a channel with no sockets; only ever discarded from
+_NO_CONNECTIONS: Set[WebSocket] = set()
+
+
 class ConnectionManager:
     """WebSocket connection manager for real-time features"""
 
     def __init__(self):
         self.active_connections: Dict[str, Set[WebSocket]] = {}
-        self.user_connections: Dict[str, WebSocket] = {}
+        # A user may be connected from several tabs or devices at once
+        self.user_connections: Dict[str, Set[WebSocket]] = defaultdict(set)
+        # Reverse index so a socket can be cleaned up without its caller's context
+        self.connection_meta: Dict[WebSocket, Tuple[str, str]] = {}
+        # Each socket gets a bounded outbox drained by its own writer task
+        self._outboxes: Dict[WebSocket, Tuple[asyncio.Queue, asyncio.Task]] = {}
+        # Sockets that receive broadcasts as pre-compressed binary frames
+        self.compressed_connections: Set[WebSocket] = set()
+        # Sockets whose writer coalesces queued broadcasts into batch frames
+        self.batched_connections: Set[WebSocket] = set()
+        # Sockets watching a single task via /ws/tasks/{task_id}
+        self.task_subscribers: Dict[str, Set[WebSocket]] = defaultdict(set)
+        # Optional Redis backplane so broadcasts reach sockets held by other workers
+        self._instance_id = uuid.uuid4().hex
+        self._redis = None
+        self._pubsub = None
+        self._pubsub_task: Optional[asyncio.Task] = None
+        self._backplane_channels: Set[str] = set()
+
+    async def start_backplane(self, redis_url: Optional[str]):
+        """Relay channel broadcasts through Redis pub/sub so every worker sees them"""
+        if not redis_url:
+            return
+        if not REDIS_AVAILABLE:
+            logger.warning("REDIS_URL is set but redis is not installed; broadcasts stay local to this worker")
+            return
 
-    async def connect(self, websocket: WebSocket, user_id: str, channel: str = "general"):
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        for channel in list(self.active_connections):
+            await self._subscribe_backplane(channel)
+        logger.info("WebSocket Redis backplane enabled")
+
+    async def stop_backplane(self):
+        """Stop relaying broadcasts through Redis"""
+        if self._pubsub_task:
+            self._pubsub_task.cancel()
+            self._pubsub_task = None
+        if self._pubsub:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._redis:
+            await self._redis.aclose()
+            self._redis = None
+        self._backplane_channels.clear()
+
+    async def _subscribe_backplane(self, channel: str):
+        """Subscribe this worker to a channel the first time one of its sockets joins it"""
+        if self._pubsub is None or channel in self._backplane_channels:
+            return
+        try:
+            await self._pubsub.subscribe(BACKPLANE_PREFIX + channel)
+        except Exception as e:
+            logger.error(f"Failed to subscribe to backplane channel {channel}: {e}")
+            return
+        self._backplane_channels.add(channel)
+        if self._pubsub_task is None:
+            self._pubsub_task = asyncio.create_task(self._pubsub_loop())
+
+    async def _pubsub_loop(self):
+        """Fan broadcasts published by other workers out to this worker's sockets"""
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True,
+                                                         timeout=BACKPLANE_POLL_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Backplane receive failed: {e}")
+                await asyncio.sleep(BACKPLANE_POLL_TIMEOUT)
+                continue
+
+            if message is None:
+                continue
+            data = message["data"]
+            if data[:32] == self._instance_id:
+                continue
+            self._local_broadcast(data[32:], message["channel"][len(BACKPLANE_PREFIX):])
+
+    async def _publish(self, channel: str, payload: str):
+        """Publish a serialized broadcast for the other workers"""
+        try:
+            await self._redis.publish(BACKPLANE_PREFIX + channel, self._instance_id + payload)
+        except Exception as e:
+            logger.error(f"Failed to publish broadcast to backplane: {e}")
+
+    async def connect(self, websocket: WebSocket, user_id: str, channel: str = "general",
+                      compress: bool = False, batch: bool = False):
         """Connect a WebSocket for a user"""
         await websocket.accept()
 
@@ -29,149 +255,272 @@ class ConnectionManager:
             self.active_connections[channel] = set()
 
         self.active_connections[channel].add(websocket)
-        self.user_connections[user_id] = websocket
+        await self._subscribe_backplane(channel)
+        self.user_connections[user_id].add(websocket)
+        self.connection_meta[websocket] = (user_id, channel)
+        if compress:
+            self.compressed_connections.add(websocket)
+        elif batch:
+            self.batched_connections.add(websocket)
+
+        self._open_outbox(websocket)
 
         logger.info(f"User {user_id} connected to channel {channel}")
 
         # Send welcome message
-        await self.send_personal_message({
+        await self.send_reply({
             "type": "connection_established",
             "user_id": user_id,
             "channel": channel,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         }, websocket)
 
-    def disconnect(self, websocket: WebSocket, user_id: str, channel: str = "general"):
-        """Disconnect a WebSocket"""
-        if channel in self.active_connections:
-            self.active_connections[channel].discard(websocket)
+    async def move(self, websocket: WebSocket, user_id: str, old_channel: str, new_channel: str):
+        """Switch an accepted WebSocket to another channel without touching the transport"""
+        self.active_connections.get(old_channel, _NO_CONNECTIONS).discard(websocket)
+        self.active_connections.setdefault(new_channel, set()).add(websocket)
+        self.connection_meta[websocket] = (user_id, new_channel)
+        await self._subscribe_backplane(new_channel)
 
-        if user_id in self.user_connections:
-            del self.user_connections[user_id]
+        logger.info(f"User {user_id} moved from channel {old_channel} to {new_channel}")
+
+    def disconnect(self, websocket: WebSocket):
+        """Disconnect a WebSocket, looking up its user and channel in the reverse index"""
+        meta = self.connection_meta.pop(websocket, None)
+        self._close_outbox(websocket)
+        if meta is None:
+            return
+
+        user_id, channel = meta
+        self.active_connections.get(channel, _NO_CONNECTIONS).discard(websocket)
+        self._forget_user_connection(websocket, user_id)
 
         logger.info(f"User {user_id} disconnected from channel {channel}")
 
-    async def send_personal_message(self, message: Dict, websocket: WebSocket):
-        """Send message to specific WebSocket"""
+    def _forget_user_connection(self, websocket: WebSocket, user_id: str):
+        """Remove one of a user's sockets, dropping the user entry once it is empty"""
+        sockets = self.user_connections.get(user_id)
+        if sockets is None:
+            return
+        sockets.discard(websocket)
+        if not sockets:
+            del self.user_connections[user_id]
+
+    def subscribe_task(self, websocket: WebSocket, task_id: str):
+        """Push updates for one task to an already-accepted WebSocket"""
+        self.task_subscribers[task_id].add(websocket)
+        self._open_outbox(websocket)
+
+    def unsubscribe_task(self, websocket: WebSocket, task_id: str):
+        """Stop pushing task updates to a WebSocket"""
+        sockets = self.task_subscribers.get(task_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.task_subscribers[task_id]
+        self._close_outbox(websocket)
+
+    def _open_outbox(self, websocket: WebSocket):
+        """Start the outbox queue and writer task for a WebSocket if it has none"""
+        if websocket not in self._outboxes:
+            queue = asyncio.Queue(maxsize=OUTBOX_MAX_SIZE)
+            writer = asyncio.create_task(self._writer(websocket, queue))
+            self._outboxes[websocket] = (queue, writer)
+
+    def _close_outbox(self, websocket: WebSocket):
+        """Stop the writer task for a WebSocket and discard its queued messages"""
+        self.compressed_connections.discard(websocket)
+        self.batched_connections.discard(websocket)
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox and outbox[1] is not asyncio.current_task():
+            outbox[1].cancel()
+
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain a connection's outbox so slow clients never block broadcasters"""
         try:
-            await websocket.send_json(message)
+            while True:
+                payload = await queue.get()
+                if websocket in self.batched_connections:
+                    payload = _coalesce(payload, queue)
+                send = websocket.send_bytes(payload) if isinstance(payload, bytes) else websocket.send_text(payload)
+                await asyncio.wait_for(send, timeout=BROADCAST_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to send personal message: {e}")
+            logger.error(f"Failed to broadcast to connection: {e}")
+            self.disconnect(websocket)
+
+    def _enqueue(self, websocket: WebSocket, payload: Union[str, bytes]):
+        """Queue a prepared payload for a WebSocket, dropping clients that cannot keep up"""
+        outbox = self._outboxes.get(websocket)
+        if outbox is None:
+            return
+
+        try:
+            outbox[0].put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("Outbox full, disconnecting slow WebSocket client")
+            self.disconnect(websocket)
+            asyncio.create_task(self._close_quietly(websocket))
+
+    async def _close_quietly(self, websocket: WebSocket):
+        """Close a WebSocket, ignoring errors from already-closed transports"""
+        try:
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    async def send_reply(self, message: Dict, websocket: WebSocket):
+        """Send a handshake or pong straight to a WebSocket, from that socket's own receive loop only"""
+        try:
+            await asyncio.wait_for(websocket.send_text(_serialize(message)), timeout=BROADCAST_SEND_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Failed to send reply: {e}")
+
+    async def send_personal_message(self, message: Dict, websocket: WebSocket):
+        """Queue a message for one WebSocket behind its pending updates"""
+        self._fan_out((websocket,), _serialize(message))
 
     async def broadcast_to_channel(self, message: Dict, channel: str = "general"):
         """Broadcast message to all connections in a channel"""
-        if channel not in self.active_connections:
+        if not self.active_connections.get(channel) and self._redis is None:
             return
 
-        disconnected = set()
-        for connection in self.active_connections[channel]:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.error(f"Failed to broadcast to connection: {e}")
-                disconnected.add(connection)
-
-        # Clean up disconnected connections
-        for conn in disconnected:
-            self.active_connections[channel].discard(conn)
+        await self._broadcast_prepared(_serialize(message), channel)
+
+    async def _broadcast_prepared(self, payload: str, channel: str):
+        """Broadcast an already-serialized message to all connections in a channel"""
+        self._local_broadcast(payload, channel)
+        if self._redis is not None:
+            await self._publish(channel, payload)
+
+    def _local_broadcast(self, payload: str, channel: str):
+        """Fan a serialized message out to this worker's connections in a channel"""
+        connections = self.active_connections.get(channel)
+        if connections:
+            self._fan_out(connections, payload)
+
+    def _fan_out(self, connections: Set[WebSocket], payload: str):
+        """Enqueue a prepared payload for each connection, compressing it at most once"""
+        # Only enqueue here; each connection's writer task does the actual send.
+        # Iterate a snapshot: a full outbox drops its socket from the set mid-loop.
+        compressed = None
+        for connection in tuple(connections):
+            if connection in self.compressed_connections:
+                if compressed is None:
+                    compressed = _compress(payload)
+                self._enqueue(connection, compressed)
+            else:
+                self._enqueue(connection, payload)
 
     async def send_to_user(self, user_id: str, message: Dict):
-        """Send message to specific user"""
-        if user_id in self.user_connections:
-            await self.send_personal_message(message, self.user_connections[user_id])
+        """Send message to every connection of a specific user"""
+        sockets = self.user_connections.get(user_id)
+        if sockets:
+            self._fan_out(sockets, _serialize(message))
 
     async def broadcast_task_update(self, task_id: str, status: str, user_id: str, result: Dict = None):
         """Broadcast task status updates"""
-        message = {
-            "type": "task_update",
-            "task_id": task_id,
-            "status": status,
-            "user_id": user_id,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
         if result:
-            message["result"] = result
+            event = TaskResultUpdate(task_id, status, user_id, _now_iso(), result)
+        else:
+            event = TaskUpdate(task_id, status, user_id, _now_iso())
 
-        await self.send_to_user(user_id, message)
-        await self.broadcast_to_channel(message, "tasks")
+        payload = _serialize(event)
+        self._fan_out(self.user_connections.get(user_id, set()), payload)
+        self._fan_out(self.task_subscribers.get(task_id, set()), payload)
+        await self._broadcast_prepared(payload, "tasks")
 
     async def broadcast_agent_status(self, agent_name: str, status: str, active_users: int = 0):
         """Broadcast agent status updates"""
-        message = {
-            "type": "agent_status",
-            "agent": agent_name,
-            "status": status,
-            "active_users": active_users,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        key = (agent_name, status, active_users, _now_iso_cached())
+        if _agent_status_cache[0] != key:
+            _agent_status_cache[0] = key
+            _agent_status_cache[1] = _serialize(AgentStatus(agent_name, status, active_users, key[3]))
 
-        await self.broadcast_to_channel(message, "agents")
+        await self._broadcast_prepared(_agent_status_cache[1], "agents")
 
     async def broadcast_system_notification(self, title: str, message: str, level: str = "info"):
         """Broadcast system-wide notifications"""
-        notification = {
-            "type": "system_notification",
-            "title": title,
-            "message": message,
-            "level": level,  # info, warning, error, success
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-        await self.broadcast_to_channel(notification, "system")
+        notification = SystemNotification(title, message, level, _now_iso())
+        await self._broadcast_prepared(_serialize(notification), "system")
 
 # Global connection manager
 manager = ConnectionManager()
 
+async def _receive_message(websocket: WebSocket) -> Dict:
+    """Receive one client message without going through Starlette's receive_json"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    raw = message.get("text")
+    return _deserialize(raw if raw is not None else message.get("bytes"))
+
+async def _handle_ping(websocket: WebSocket, user_id: str, channel: str, data: Dict) -> str:
+    await manager.send_reply({"type": "pong"}, websocket)
+    return channel
+
+async def _handle_subscribe_channel(websocket: WebSocket, user_id: str, channel: str, data: Dict) -> str:
+    new_channel = data.get("channel", "general")
+    await manager.move(websocket, user_id, channel, new_channel)
+    return new_channel
+
+async def _handle_task_status_request(websocket: WebSocket, user_id: str, channel: str, data: Dict) -> str:
+    task_id = data.get("task_id")
+    # Could implement task status lookup here
+    await manager.send_personal_message({
+        "type": "task_status_response",
+        "task_id": task_id,
+        "status": "checking"
+    }, websocket)
+    return channel
+
+# Client message type -> handler; each handler returns the channel the socket is on afterwards
+_HANDLERS: Dict[str, Callable[[WebSocket, str, str, Dict], Awaitable[str]]] = {
+    "ping": _handle_ping,
+    "subscribe_channel": _handle_subscribe_channel,
+    "task_status_request": _handle_task_status_request,
+}
+
 @router.websocket("/ws/{user_id}")
-async def websocket_endpoint(websocket: WebSocket, user_id: str, channel: str = "general"):
-    """Main WebSocket endpoint"""
-    await manager.connect(websocket, user_id, channel)
+async def websocket_endpoint(websocket: WebSocket, user_id: str, channel: str = "general",
+                             compress: bool = False, batch: bool = False):
+    """Main WebSocket endpoint
+
+    Pass ?compress=true to receive broadcasts as compressed binary frames, or
+    ?batch=true to receive bursts of broadcasts coalesced into batch frames.
+    """
+    await manager.connect(websocket, user_id, channel, compress, batch)
 
     try:
         while True:
             # Receive message from client
-            data = await websocket.receive_json()
+            data = await _receive_message(websocket)
 
             # Handle different message types
-            message_type = data.get("type", "unknown")
-
-            if message_type == "ping":
-                await manager.send_personal_message({"type": "pong"}, websocket)
+            handler = _HANDLERS.get(data.get("type", "unknown"))
+            if handler:
+                channel = await handler(websocket, user_id, channel, data)
 
-            elif message_type == "subscribe_channel":
-                new_channel = data.get("channel", "general")
-                # Reconnect to new channel
-                manager.disconnect(websocket, user_id, channel)
-                await manager.connect(websocket, user_id, new_channel)
-                channel = new_channel
-
-            elif message_type == "task_status_request":
-                task_id = data.get("task_id")
-                # Could implement task status lookup here
+            if ECHO_ENABLED:
+                # Echo back for debugging
                 await manager.send_personal_message({
-                    "type": "task_status_response",
-                    "task_id": task_id,
-                    "status": "checking"
+                    "type": "echo",
+                    "original_message": data,
+                    "timestamp": _now_iso_cached()
                 }, websocket)
 
-            # Echo back for debugging
-            await manager.send_personal_message({
-                "type": "echo",
-                "original_message": data,
-                "timestamp": datetime.utcnow().isoformat()
-            }, websocket)
-
     except WebSocketDisconnect:
-        manager.disconnect(websocket, user_id, channel)
+        manager.disconnect(websocket)
     except Exception as e:
         logger.error(f"WebSocket error for user {user_id}: {e}")
-        manager.disconnect(websocket, user_id, channel)
+        manager.disconnect(websocket)
 
 @router.websocket("/ws/tasks/{task_id}")
 async def task_websocket_endpoint(websocket: WebSocket, task_id: str):
     """WebSocket endpoint for specific task monitoring"""
     await websocket.accept()
+    manager.subscribe_task(websocket, task_id)
 
     try:
         # Send initial task status
@@ -179,12 +528,12 @@ async def task_websocket_endpoint(websocket: WebSocket, task_id: str):
             "type": "task_info",
             "task_id": task_id,
             "status": "connected",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _now_iso()
         })
 
         while True:
-            # Keep connection alive and listen for task updates
-            data = await websocket.receive_json()
+            # Updates are pushed by broadcast_task_update; this only wakes for client frames
+            data = await _receive_message(websocket)
 
             if data.get("type") == "ping":
                 await websocket.send_json({"type": "pong"})
@@ -193,6 +542,8 @@ async def task_websocket_endpoint(websocket: WebSocket, task_id: str):
         pass
     except Exception as e:
         logger.error(f"Task WebSocket error for task {task_id}: {e}")
+    finally:
+        manager.unsubscribe_task(websocket, task_id)
 
 # Helper functions for external use
 async def notify_task_update(task_id: str, status: str, user_id: str, result: Dict = None):
@@ -214,6 +565,6 @@ async def send_user_notification(user_id: str, title: str, message: str, level:
         "title": title,
         "message": message,
         "level": level,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
     await manager.send_to_user(user_id, notification)
\ No newline at end of file